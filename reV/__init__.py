@@ -3,17 +3,9 @@
 The Renewable Energy Potential Model
 """
 from __future__ import print_function, division, absolute_import
+import importlib
 import os
 
-from reV.econ import Econ
-from reV.generation import Gen
-from reV.handlers import Outputs, ExclusionLayers
-from reV.pipeline import Pipeline, Status
-from reV.qa_qc import QaQc
-from reV.rep_profiles import RepProfiles
-from reV.supply_curve import (Aggregation, ExclusionMask,
-                              ExclusionMaskFromDict, SupplyCurveAggregation,
-                              SupplyCurve, TechMapping)
 from reV.version import __version__
 
 __author__ = """Galen Maclaurin"""
@@ -22,3 +14,39 @@ __email__ = "galen.maclaruin@nrel.gov"
 
 REVDIR = os.path.dirname(os.path.realpath(__file__))
 TESTDATADIR = os.path.join(os.path.dirname(REVDIR), 'tests', 'data')
+
+# Top-level classes are imported on first access (PEP 562) so that
+# "import reV" doesn't pay for numpy, pandas, h5py, and PySAM up front.
+_LAZY_IMPORTS = {'Econ': 'reV.econ',
+                 'Gen': 'reV.generation',
+                 'Outputs': 'reV.handlers',
+                 'ExclusionLayers': 'reV.handlers',
+                 'Pipeline': 'reV.pipeline',
+                 'Status': 'reV.pipeline',
+                 'QaQc': 'reV.qa_qc',
+                 'RepProfiles': 'reV.rep_profiles',
+                 'Aggregation': 'reV.supply_curve',
+                 'ExclusionMask': 'reV.supply_curve',
+                 'ExclusionMaskFromDict': 'reV.supply_curve',
+                 'SupplyCurveAggregation': 'reV.supply_curve',
+                 'SupplyCurve': 'reV.supply_curve',
+                 'TechMapping': 'reV.supply_curve',
+                 }
+
+
+def __getattr__(name):
+    """Import top-level reV classes on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             .format(__name__, name))
+
+    module = importlib.import_module(_LAZY_IMPORTS[name])
+    attr = getattr(module, name)
+    globals()[name] = attr
+
+    return attr
+
+
+def __dir__():
+    """Include lazily imported classes in dir(reV)."""
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -2,23 +2,180 @@
 """
 reV Base Configuration Framework
 """
+from collections import defaultdict
+from functools import lru_cache, partial
 import json
 import logging
 import os
+import re
 
 from rex.utilities import safe_json_load
 from rex.utilities.utilities import get_class_properties
 
 from reV.utilities.exceptions import ConfigError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 REVDIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 TESTDATADIR = os.path.join(os.path.dirname(REVDIR), 'tests', 'data')
 
 
+def _json_clone(obj, str_sub=None):
+    """Fast deep copy of json-like data.
+
+    Only dicts and lists are copied, all other json types (str, int, float,
+    bool, None) are immutable and are shared with the input.
+
+    Parameters
+    ----------
+    obj : dict | list | str | int | float | bool | None
+        Json-like object to copy.
+    str_sub : callable, optional
+        Function applied to every string value while copying (e.g. config
+        string replacement), by default None (strings are shared as-is).
+
+    Returns
+    -------
+    out : dict | list | str | int | float | bool | None
+        Copy of obj that shares no mutable containers with obj.
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {k: _json_clone(v, str_sub) for k, v in obj.items()}
+    elif obj_type is list:
+        return [_json_clone(v, str_sub) for v in obj]
+    elif obj_type is str and str_sub is not None:
+        return str_sub(obj)
+
+    return obj
+
+
+def _str_replace_walk(obj, str_sub, memo):
+    """Deep string replacement in json-like data, dispatching on type.
+
+    Parameters
+    ----------
+    obj : dict | list | str | int | float | bool | None
+        Json-like object to process. Dicts and lists are updated in place.
+    str_sub : callable
+        Function mapping a string to the string with all replacements.
+    memo : dict
+        Mapping of id(container) to already-processed containers.
+
+    Returns
+    -------
+    obj : dict | list | str | int | float | bool | None
+        Input object with replaced strings (same object for containers).
+    """
+    if isinstance(obj, (dict, list)):
+        if id(obj) in memo:
+            return memo[id(obj)]
+
+        memo[id(obj)] = obj
+
+    if isinstance(obj, dict):
+        _str_replace_dict(obj, str_sub, memo)
+    elif isinstance(obj, list):
+        _str_replace_list(obj, str_sub, memo)
+    elif isinstance(obj, str):
+        # single scan of the string for all replacement keys
+        obj = str_sub(obj)
+
+    return obj
+
+
+def _str_replace_dict(obj, str_sub, memo):
+    """Replace strings in the values of a dict in place.
+
+    Parameters
+    ----------
+    obj : dict
+        Dictionary to update in place. Nested containers are updated in
+        place so only strings need to be written back.
+    str_sub : callable
+        Function mapping a string to the string with all replacements.
+    memo : dict
+        Mapping of id(container) to already-processed containers.
+    """
+    for key, val in obj.items():
+        if isinstance(val, str):
+            obj[key] = str_sub(val)
+        else:
+            _str_replace_walk(val, str_sub, memo)
+
+
+def _str_replace_list(obj, str_sub, memo):
+    """Replace strings in the entries of a list in place.
+
+    Parameters
+    ----------
+    obj : list
+        List to update in place. Nested containers are updated in place so
+        only strings need to be written back.
+    str_sub : callable
+        Function mapping a string to the string with all replacements.
+    memo : dict
+        Mapping of id(container) to already-processed containers.
+    """
+    for i, entry in enumerate(obj):
+        if isinstance(entry, str):
+            obj[i] = str_sub(entry)
+        else:
+            _str_replace_walk(entry, str_sub, memo)
+
+
+@lru_cache(maxsize=128)
+def _load_json_cached(fname, mtime_ns, size):
+    """Load and cache a json file keyed on its path, mtime, and size so that
+    edits to the file on disk invalidate the cached entry.
+
+    Parameters
+    ----------
+    fname : str
+        Absolute path to .json file.
+    mtime_ns : int
+        File modification time in nanoseconds.
+    size : int
+        File size in bytes.
+
+    Returns
+    -------
+    config : dict
+        Parsed json data. This is shared between callers and must not be
+        mutated.
+    text : str
+        Raw json text of the file.
+    """
+    with open(fname, 'rb') as f:
+        text = f.read().decode('utf-8')
+
+    if orjson is not None:
+        try:
+            return orjson.loads(text), text
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the stdlib (e.g. NaN literals), fall
+            # back to safe_json_load which also raises informative errors
+            pass
+
+    return safe_json_load(fname), text
+
+
 class BaseConfig(dict):
     """Base class for configuration frameworks."""
     REQUIREMENTS = ()
+    LOG_LEVELS = {'DEBUG': logging.DEBUG,
+                  'INFO': logging.INFO,
+                  'WARNING': logging.WARNING,
+                  'ERROR': logging.ERROR,
+                  'CRITICAL': logging.CRITICAL,
+                  }
+    STR_REP = {'REVDIR': REVDIR,
+               'TESTDATADIR': TESTDATADIR,
+               }
 
     def __init__(self, config, check_keys=True, perform_str_rep=True):
         """
@@ -35,9 +192,7 @@ class BaseConfig(dict):
 
         # str_rep is a mapping of config strings to replace with real values
         self._perform_str_rep = perform_str_rep
-        self.str_rep = {'REVDIR': REVDIR,
-                        'TESTDATADIR': TESTDATADIR,
-                        }
+        self.str_rep = dict(self.STR_REP)
 
         self._config_dir = None
         self._log_level = None
@@ -84,15 +239,8 @@ class BaseConfig(dict):
         """
 
         if self._log_level is None:
-            levels = {'DEBUG': logging.DEBUG,
-                      'INFO': logging.INFO,
-                      'WARNING': logging.WARNING,
-                      'ERROR': logging.ERROR,
-                      'CRITICAL': logging.CRITICAL,
-                      }
-
             x = str(self.get('log_level', 'INFO'))
-            self._log_level = levels[x.upper()]
+            self._log_level = self.LOG_LEVELS[x.upper()]
 
         return self._log_level
 
@@ -192,21 +340,50 @@ class BaseConfig(dict):
         # str is either json file path or serialized json object
         if isinstance(config, str):
             if config.endswith('.json'):
-                self._config_dir = os.path.dirname(os.path.realpath(config))
-                self._config_dir += '/'
-                self._config_dir = self._config_dir.replace('\\', '/')
+                config_dir = os.path.dirname(os.path.abspath(config)) + '/'
+                self._config_dir = config_dir.replace('\\', '/')
                 self.str_rep['./'] = self.config_dir
-                config = self.get_file(config)
+                # string replacement is done while copying the cached file
+                strrep = self.str_rep if self._perform_str_rep else None
+                config = self._get_file(config, strrep=strrep)
             else:
                 # attempt to deserialize non-json string
+                text = config
                 config = json.loads(config)
+                if (self._perform_str_rep
+                        and self._needs_str_rep(text, self.str_rep)):
+                    config = self.str_replace(config, self.str_rep)
 
         # Perform string replacement, save config to self instance
-        if self._perform_str_rep:
+        elif self._perform_str_rep:
             config = self.str_replace(config, self.str_rep)
 
         self.set_self_dict(config)
 
+    @staticmethod
+    def _needs_str_rep(text, strrep):
+        """Check if any of the str_rep keys can be present in a config.
+
+        Parameters
+        ----------
+        text : str
+            Raw json text the config was parsed from.
+        strrep : dict
+            Replacement mapping where keys are strings to search for and values
+            are the new values.
+
+        Returns
+        -------
+        bool
+            False if the config can be skipped by str_replace.
+        """
+        # json escapes (e.g. "\/" or "\u...") could hide a key in the raw
+        # text so only trust text without any backslashes
+        if '\\' in text:
+            return True
+
+        return any(key in text for key in strrep)
+
     @staticmethod
     def check_files(flist):
         """Make sure all files in the input file list exist.
@@ -216,16 +393,65 @@ class BaseConfig(dict):
         flist : list
             List of files (with paths) to check existance of.
         """
+        # group files by directory so that each directory is only listed once
+        dir_files = defaultdict(list)
         for f in flist:
             # ignore files that are to be specified using pipeline utils
             if 'PIPELINE' not in os.path.basename(f):
-                if os.path.exists(f) is False:
-                    raise IOError('File does not exist: {}'.format(f))
+                dir_files[os.path.dirname(f)].append(f)
+
+        missing = []
+        for d, files in dir_files.items():
+            try:
+                with os.scandir(d or '.') as entries:
+                    present = {entry.name for entry in entries}
+            except OSError:
+                present = set()
+
+            # names not found in the listing (e.g. on case-insensitive file
+            # systems) fall back to a direct check
+            missing += [f for f in files
+                        if os.path.basename(f) not in present
+                        and not os.path.exists(f)]
+
+        if missing:
+            raise IOError('File(s) do not exist: {}'.format(missing))
+
+    @staticmethod
+    def _get_str_sub(strrep):
+        """Get a function that performs all string replacements on a single
+        string in one regex pass.
+
+        Parameters
+        ----------
+        strrep : dict
+            Replacement mapping where keys are strings to search for and values
+            are the new values.
+
+        Returns
+        -------
+        str_sub : callable
+            Function mapping a string to the string with all replacements.
+            The keys are compiled into a single escaped alternation, longest
+            keys first so that overlapping keys resolve to the most specific
+            match.
+        """
+        keys = sorted(strrep, key=len, reverse=True)
+        regex = re.compile('|'.join(map(re.escape, keys)))
+
+        def repl(match):
+            return strrep[match.group(0)]
+
+        return partial(regex.sub, repl)
 
     @classmethod
-    def str_replace(cls, d, strrep):
+    def str_replace(cls, d, strrep, memo=None):
         """Perform a deep string replacement in d.
 
+        Dicts and lists in d are modified in place and returned as the same
+        objects. Strings are immutable so a top-level str input is returned
+        as a new string.
+
         Parameters
         ----------
         d : dict
@@ -233,31 +459,26 @@ class BaseConfig(dict):
         strrep : dict
             Replacement mapping where keys are strings to search for and values
             are the new values.
+        memo : dict, optional
+            Mapping of id(container) to already-processed containers so that
+            dicts and lists shared within the config are only walked once,
+            by default None (new memo).
 
         Returns
         -------
         d : dict
-            Config dictionary with replaced strings.
+            Input config dictionary (same object) with replaced strings.
         """
 
-        if isinstance(d, dict):
-            # go through dict keys and values
-            for key, val in d.items():
-                d[key] = cls.str_replace(val, strrep)
+        if memo is None:
+            memo = {}
 
-        elif isinstance(d, list):
-            # if the value is also a list, iterate through
-            for i, entry in enumerate(d):
-                d[i] = cls.str_replace(entry, strrep)
+        if not strrep:
+            return d
 
-        elif isinstance(d, str):
-            # if val is a str, check to see if str replacements apply
-            for old_str, new in strrep.items():
-                # old_str is in the value, replace with new value
-                d = d.replace(old_str, new)
+        sub = cls._get_str_sub(strrep)
 
-        # return updated
-        return d
+        return _str_replace_walk(d, sub, memo)
 
     def set_self_dict(self, dictlike):
         """Save a dict-like variable as object instance dictionary items.
@@ -267,17 +488,20 @@ class BaseConfig(dict):
         dictlike : dict
             Python namespace object to set to this dictionary-emulating class.
         """
-        for key, val in dictlike.items():
-            self.__setitem__(key, val)
+        self.update(dictlike)
 
-    @staticmethod
-    def get_file(fname):
-        """Read the config file.
+    @classmethod
+    def _get_file(cls, fname, strrep=None):
+        """Read the config file from the json cache.
 
         Parameters
         ----------
         fname : str
             Full path + filename. Must be a .json file.
+        strrep : dict, optional
+            Replacement mapping where keys are strings to search for and values
+            are the new values. String replacement is performed while copying
+            the cached config, by default None (no replacement).
 
         Returns
         -------
@@ -286,12 +510,40 @@ class BaseConfig(dict):
         """
 
         logger.debug('Getting "{}"'.format(fname))
-        if os.path.exists(fname) and fname.endswith('.json'):
-            config = safe_json_load(fname)
-        elif os.path.exists(fname) is False:
+        fname = os.path.abspath(fname)
+        try:
+            # single stat for both the existence check and the cache key
+            stat = os.stat(fname)
+        except FileNotFoundError as e:
             raise FileNotFoundError('Configuration file does not exist: "{}"'
-                                    .format(fname))
-        else:
+                                    .format(fname)) from e
+
+        if not fname.endswith('.json'):
             raise ConfigError('Unknown error getting configuration file: "{}"'
                               .format(fname))
-        return config
+
+        config, text = _load_json_cached(fname, stat.st_mtime_ns,
+                                         stat.st_size)
+        str_sub = None
+        if strrep and cls._needs_str_rep(text, strrep):
+            str_sub = cls._get_str_sub(strrep)
+
+        # copy so that str replacement and user edits can't leak into
+        # the cache
+        return _json_clone(config, str_sub=str_sub)
+
+    @classmethod
+    def get_file(cls, fname):
+        """Read the config file.
+
+        Parameters
+        ----------
+        fname : str
+            Full path + filename. Must be a .json file.
+
+        Returns
+        -------
+        config : dict
+            Config data.
+        """
+        return cls._get_file(fname)
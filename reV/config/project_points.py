@@ -2,7 +2,9 @@
 """
 reV Project Points Configuration
 """
+from concurrent.futures import ThreadPoolExecutor
 import copy
+from functools import lru_cache
 import logging
 from math import ceil
 import numpy as np
@@ -23,6 +25,76 @@ from rex.utilities import check_res_file, parse_table
 logger = logging.getLogger(__name__)
 
 
+def _get_n_sites(res_file, multi_h5_res=False):
+    """Open a resource file and get its number of sites.
+
+    Parameters
+    ----------
+    res_file : str
+        Filepath to single resource file, multi-h5 directory,
+        or /h5_dir/prefix*suffix
+    multi_h5_res : bool
+        Flag for a multi-h5 directory or /h5_dir/prefix*suffix res_file
+
+    Returns
+    -------
+    n_sites : int
+        Number of sites (gids) in the resource file.
+    """
+    res_cls = MultiFileResource if multi_h5_res else Resource
+    with res_cls(res_file) as res:
+        n_sites = res.shape[1]
+
+    return n_sites
+
+
+@lru_cache(maxsize=16)
+def _res_n_sites_cached(res_file, mtime_ns, size):
+    """Get the number of sites in a single resource file, cached on its path,
+    mtime, and size so that rewriting the file invalidates the cached entry.
+
+    Parameters
+    ----------
+    res_file : str
+        Filepath to single resource file.
+    mtime_ns : int
+        File modification time in nanoseconds.
+    size : int
+        File size in bytes.
+
+    Returns
+    -------
+    n_sites : int
+        Number of sites (gids) in the resource file.
+    """
+    return _get_n_sites(res_file)
+
+
+def _res_n_sites(res_file):
+    """Get the number of sites in a resource file. Single files are cached so
+    that project points built from open-ended slices don't reopen the file.
+
+    Parameters
+    ----------
+    res_file : str
+        Filepath to single resource file, multi-h5 directory,
+        or /h5_dir/prefix*suffix
+
+    Returns
+    -------
+    n_sites : int
+        Number of sites (gids) in the resource file.
+    """
+    multi_h5_res, hsds = check_res_file(res_file)
+    if multi_h5_res or hsds:
+        # directories, globs, and remote files have no single file stat
+        return _get_n_sites(res_file, multi_h5_res=multi_h5_res)
+
+    stat = os.stat(res_file)
+
+    return _res_n_sites_cached(res_file, stat.st_mtime_ns, stat.st_size)
+
+
 class PointsControl:
     """Class to manage and split ProjectPoints."""
     def __init__(self, project_points, sites_per_split=100):
@@ -40,62 +112,129 @@ class PointsControl:
         self._sites_per_split = sites_per_split
         self._split_range = []
         self._i = 0
-        self._iter_list = []
+        self._last_site = 0
+        self._ilim = len(project_points)
+        self._executor = None
+        self._prefetch = None
 
     def __iter__(self):
-        """Initialize the iterator by pre-splitting into a list attribute."""
-        last_site = 0
-        ilim = len(self.project_points)
+        """Iterate through the splits, which are created on demand.
 
-        logger.debug('PointsControl iterator initializing with sites '
-                     '{} through {}'.format(self.project_points.sites[0],
-                                            self.project_points.sites[-1]))
+        The prefetch thread is shut down when the iteration finishes or is
+        abandoned early (e.g. on break or an exception in the loop body).
 
-        # pre-initialize all iter objects
-        while True:
-            i0 = last_site
-            i1 = np.min([i0 + self.sites_per_split, ilim])
-            if i0 == i1:
-                break
+        Yields
+        ------
+        next_pc : config.PointsControl
+            Split instance of this class with a subset of project points based
+            on the number of sites per split.
+        """
+        self._close_prefetch()
+        self._i = 0
+        self._last_site = 0
+        self._ilim = len(self.project_points)
+        gids = self.project_points.df['gid'].values
 
-            last_site = i1
+        logger.debug('PointsControl iterator initializing with sites '
+                     '%s through %s', gids[0], gids[-1])
 
-            new = self.split(i0, i1, self.project_points,
-                             sites_per_split=self.sites_per_split)
-            new._split_range = [i0, i1]
-            self._iter_list.append(new)
+        try:
+            while True:
+                try:
+                    next_pc = next(self)
+                except StopIteration:
+                    return
 
-        logger.debug('PointsControl stopped iteration at attempted '
-                     'index of {}. Length of iterator is: {}'
-                     .format(i1, len(self)))
-        return self
+                yield next_pc
+        finally:
+            self._close_prefetch()
 
     def __next__(self):
         """Iterate through and return next site resource data.
 
+        The split following the one returned is built on a background thread
+        while the caller processes the current split.
+
         Returns
         -------
         next_pc : config.PointsControl
             Split instance of this class with a subset of project points based
             on the number of sites per split.
         """
-        if self._i < self.N:
-            # Get next PointsControl from the iter list
-            next_pc = self._iter_list[self._i]
+        if self._prefetch is None:
+            next_pc = self._next_split()
         else:
-            # No more points controllers left in initialized list
+            next_pc = self._prefetch.result()
+            self._prefetch = None
+
+        if next_pc is None:
+            self._close_prefetch()
+            logger.debug('PointsControl stopped iteration at attempted '
+                         'index of %s. Length of iterator is: %s',
+                         self._last_site, len(self))
             raise StopIteration
 
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._prefetch = self._executor.submit(self._next_split)
+
         logger.debug('PointsControl passing site project points '
-                     'with indices {} to {} on iteration #{} '
-                     .format(next_pc.split_range[0],
-                             next_pc.split_range[1], self._i))
+                     'with indices %s to %s on iteration #%s ',
+                     next_pc.split_range[0], next_pc.split_range[1], self._i)
         self._i += 1
         return next_pc
 
+    def __getstate__(self):
+        """Drop the prefetch thread and future when pickling. A pending
+        prefetched split is not pickled, so the copy resumes from its first
+        site instead."""
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_prefetch'] = None
+        if self._prefetch is not None:
+            next_pc = self._prefetch.result()
+            if next_pc is not None:
+                state['_last_site'] = next_pc.split_range[0]
+
+        return state
+
+    def _next_split(self):
+        """Build the next split of the project points.
+
+        Returns
+        -------
+        next_pc : config.PointsControl | None
+            Split instance of this class with the next subset of project
+            points or None if all sites have been split.
+        """
+        i0 = self._last_site
+        i1 = min(i0 + self.sites_per_split, self._ilim)
+        if i0 == i1:
+            return None
+
+        self._last_site = i1
+        next_pc = self.split(i0, i1, self.project_points,
+                             sites_per_split=self.sites_per_split)
+        next_pc._split_range = [i0, i1]
+
+        return next_pc
+
+    def _close_prefetch(self):
+        """Wait on any pending prefetched split and stop the prefetch
+        thread."""
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def __repr__(self):
+        gids = self.project_points.df['gid'].values
         msg = ("{} for sites {} through {}"
-               .format(self.__class__.__name__, self.sites[0], self.sites[-1]))
+               .format(self.__class__.__name__, gids[0], gids[-1]))
         return msg
 
     def __len__(self):
@@ -105,14 +244,14 @@ class PointsControl:
     @property
     def N(self):
         """
-        Length of current iterator list
+        Length of the iterator
 
         Returns
         -------
         N : int
-            Number of iterators in list
+            Number of splits (iterations) of this PointsControl instance
         """
-        return len(self._iter_list)
+        return len(self)
 
     @property
     def sites_per_split(self):
@@ -248,6 +387,8 @@ class ProjectPoints:
         self._check_points_config_mapping()
         self._tech = str(tech)
         self._h = None
+        self._gid_map = None
+        self._config_sites = None
         self._curtailment = self._parse_curtailment(curtailment)
 
     def __getitem__(self, site):
@@ -268,9 +409,8 @@ class ProjectPoints:
             names (keys) and values.
         """
 
-        site_bool = (self.df['gid'] == site)
         try:
-            config_id = self.df.loc[site_bool, 'config'].values[0]
+            config_id = self.gid_map[site]
         except KeyError:
             raise KeyError('Site {} not found in this instance of '
                            'ProjectPoints. Available sites include: {}'
@@ -279,13 +419,14 @@ class ProjectPoints:
         return config_id, copy.deepcopy(self.sam_configs[config_id])
 
     def __repr__(self):
+        gids = self.df['gid'].values
         msg = ("{} for sites {} through {}"
-               .format(self.__class__.__name__, self.sites[0], self.sites[-1]))
+               .format(self.__class__.__name__, gids[0], gids[-1]))
         return msg
 
     def __len__(self):
         """Length of this object is the number of sites."""
-        return len(self.sites)
+        return len(self.df)
 
     @classmethod
     def _parse_points(cls, points, res_file=None):
@@ -317,12 +458,14 @@ class ProjectPoints:
             raise ValueError('Cannot parse Project points data from {}'
                              .format(type(points)))
 
-        if ('gid' not in df.columns or 'config' not in df.columns):
+        if not {'gid', 'config'}.issubset(df.columns):
             raise KeyError('Project points data must contain "gid" and '
                            '"config" column headers.')
 
+        # monotonic check instead of comparing against a sorted copy, this
+        # runs for every ProjectPoints split
         gids = df['gid'].values
-        if not np.array_equal(np.sort(gids), gids):
+        if (gids[1:] < gids[:-1]).any():
             msg = ('WARNING: points are not in sequential order and will be '
                    'sorted! The original order is being preserved under '
                    'column "points_order"')
@@ -349,7 +492,16 @@ class ProjectPoints:
             DataFrame mapping sites (gids) to SAM technology (config)
         """
         if fname.endswith('.csv'):
-            df = pd.read_csv(fname)
+            try:
+                # multi-threaded columnar parse when pyarrow is available
+                df = pd.read_csv(fname, engine='pyarrow')
+            except (ImportError, ValueError):
+                df = pd.read_csv(fname)
+            else:
+                # match the default engine's names for blank headers
+                # (e.g. a saved dataframe index)
+                df.columns = [c if c else 'Unnamed: {}'.format(i)
+                              for i, c in enumerate(df.columns)]
         else:
             raise ValueError('Config project points file must be '
                              '.csv, but received: {}'
@@ -374,10 +526,9 @@ class ProjectPoints:
         df : pd.DataFrame
             DataFrame mapping sites (gids) to SAM technology (config)
         """
-        df = pd.DataFrame(columns=['gid', 'config'])
         if isinstance(points, (list, tuple)):
             # explicit site list, set directly
-            df['gid'] = points
+            gids = points
         elif isinstance(points, slice):
             stop = points.stop
             if stop is None:
@@ -386,19 +537,16 @@ class ProjectPoints:
                                      'points is a slice of type '
                                      ' slice(*, None, *)')
 
-                multi_h5_res, _ = check_res_file(res_file)
-                if multi_h5_res:
-                    stop = MultiFileResource(res_file).shape[1]
-                else:
-                    stop = Resource(res_file).shape[1]
+                stop = _res_n_sites(res_file)
 
-            df['gid'] = list(range(*points.indices(stop)))
+            gids = np.arange(*points.indices(stop))
         else:
             raise TypeError('Project Points sites needs to be set as a list, '
                             'tuple, or slice, but was set as: {}'
                             .format(type(points)))
 
-        df['config'] = None
+        # build the frame in one go, the config column is a scalar broadcast
+        df = pd.DataFrame({'gid': gids, 'config': None})
 
         return df
 
@@ -416,15 +564,14 @@ class ProjectPoints:
         ind : int
             Row index of gid in the project points dataframe.
         """
-        if gid not in self._df['gid'].values:
+        ind = np.where(self._df['gid'].values == gid)[0]
+        if not len(ind):
             e = ('Requested resource gid {} is not present in the project '
                  'points dataframe. Cannot return row index.'.format(gid))
             logger.error(e)
             raise ConfigError(e)
 
-        ind = np.where(self._df['gid'] == gid)[0][0]
-
-        return ind
+        return ind[0]
 
     @property
     def df(self):
@@ -438,6 +585,23 @@ class ProjectPoints:
         """
         return self._df
 
+    @property
+    def gid_map(self):
+        """Get a mapping of site gids to SAM config IDs.
+
+        Returns
+        -------
+        _gid_map : dict
+            Dictionary mapping each site (resource gid) in the project points
+            dataframe to its SAM configuration ID. Built once on first access
+            so that site lookups don't scan the dataframe.
+        """
+        if self._gid_map is None:
+            self._gid_map = dict(zip(self._df['gid'].values.tolist(),
+                                     self._df['config'].values.tolist()))
+
+        return self._gid_map
+
     @staticmethod
     def _parse_sam_config(sam_config):
         """
@@ -556,19 +720,24 @@ class ProjectPoints:
         # config will be None and needs to be added to _df from sam_configs
         if len(df_configs) == 1:
             if df_configs[0] is None:
-                self._df['config'] = list(sam_configs.values())[0]
+                config = list(sam_configs.values())[0]
+                self._df['config'] = config
+                self._gid_map = None
+                self._config_sites = None
 
-                df_configs = self.df['config'].unique()
+                # the column now holds a single known value, no need to rescan
+                df_configs = [config]
 
         # Check to see if config references in project_points DataFrame
-        # are valid file paths, if compare with SAM configs
-        # and update as needed
+        # are SAM config IDs or valid file paths and update as needed.
+        # Check the IDs first so that splits sharing the parent's SAMConfig
+        # don't hit the file system.
         configs = {}
         for config in df_configs:
-            if os.path.isfile(config):
-                configs[config] = config
-            elif config in sam_configs:
+            if config in sam_configs:
                 configs[config] = sam_configs[config]
+            elif os.path.isfile(config):
+                configs[config] = config
             else:
                 msg = ('{} does not map to a valid configuration file'
                        .format(config))
@@ -584,6 +753,13 @@ class ProjectPoints:
             logger.error(msg)
             raise ConfigError(msg)
 
+        # store config IDs as categoricals so that the column holds integer
+        # codes instead of one string reference per site. Splits inherit
+        # the dtype from the parent dataframe.
+        if not isinstance(self._df['config'].dtype, pd.CategoricalDtype):
+            self._df = self._df.assign(
+                config=self._df['config'].astype('category'))
+
     @property
     def gids(self):
         """Get the list of gids (resource file index values) belonging to this
@@ -621,17 +797,17 @@ class ProjectPoints:
             The type is slice if possible. Will be a list only if sites are
             non-sequential.
         """
-        # try_slice is what the sites list would be if it is sequential
-        if len(self.sites) > 1:
-            try_step = self.sites[1] - self.sites[0]
+        # sites are sequential if every step equals the first step
+        gids = self.df['gid'].values
+        if len(gids) > 1:
+            try_step = gids[1] - gids[0]
         else:
             try_step = 1
-        try_slice = slice(self.sites[0], self.sites[-1] + 1, try_step)
-        try_list = list(range(*try_slice.indices(try_slice.stop)))
 
-        if self.sites == try_list:
-            # try_slice is equivelant to the site list
-            sites_as_slice = try_slice
+        if try_step > 0 and (np.diff(gids) == try_step).all():
+            # a slice is equivelant to the site list
+            sites_as_slice = slice(int(gids[0]), int(gids[-1]) + 1,
+                                   int(try_step))
         else:
             # cannot be converted to a sequential slice, return list
             sites_as_slice = self.sites
@@ -668,8 +844,12 @@ class ProjectPoints:
         h_var = 'wind_turbine_hub_ht'
         if self._h is None:
             if 'wind' in self.tech:
-                # wind technology, get a list of h values
-                self._h = [self[site][1][h_var] for site in self.sites]
+                # wind technology, get a list of h values mapped from the
+                # hub height of each config used by the project points
+                configs = self.df['config']
+                h = {config_id: self.sam_configs[config_id][h_var]
+                     for config_id in configs.unique()}
+                self._h = configs.map(h).values.tolist()
 
         return self._h
 
@@ -745,6 +925,8 @@ class ProjectPoints:
         df2_cols = [c for c in df2.columns if c not in self._df or c == key]
         self._df = pd.merge(self._df, df2[df2_cols], how='left', left_on='gid',
                             right_on=key, copy=False, validate='1:1')
+        self._gid_map = None
+        self._config_sites = None
 
     def get_sites_from_config(self, config):
         """Get a site list that corresponds to a config key.
@@ -761,8 +943,16 @@ class ProjectPoints:
             the configuration ID is not recognized, an empty list is returned.
         """
 
-        sites = self.df.loc[(self.df['config'] == config), 'gid'].values
-        return list(sites)
+        if self._config_sites is None:
+            # group the gids by config once instead of scanning the config
+            # column for every requested config
+            gids = self.df['gid'].values
+            groups = self.df.groupby('config', observed=True,
+                                     sort=False).indices
+            self._config_sites = {config_id: gids[ind].tolist()
+                                  for config_id, ind in groups.items()}
+
+        return list(self._config_sites.get(config, []))
 
     @classmethod
     def split(cls, i0, i1, project_points):
@@ -796,7 +986,12 @@ class ProjectPoints:
             raise ValueError('{} and {} must be within the range of '
                              'project_points (0 - {})'.format(i0, i1, n - 1))
 
-        points_df = project_points.df.iloc[i0:i1]
+        full = i0 <= 0 and i1 >= n
+        if full:
+            # split covers all sites, share the parent dataframe
+            points_df = project_points.df
+        else:
+            points_df = project_points.df.iloc[i0:i1]
 
         # make a new instance of ProjectPoints with subset DF
         sub = cls(points_df,
@@ -804,6 +999,11 @@ class ProjectPoints:
                   project_points.tech,
                   curtailment=project_points.curtailment)
 
+        if full:
+            # site lookups are identical to the parent's
+            sub._gid_map = project_points._gid_map
+            sub._config_sites = project_points._config_sites
+
         return sub
 
     @staticmethod
@@ -880,7 +1080,7 @@ class ProjectPoints:
 
         logger.info('Converting latitude longitude coordinates into nearest '
                     'ProjectPoints')
-        logger.debug('- (lat, lon) pairs:\n{}'.format(lat_lons))
+        logger.debug('- (lat, lon) pairs:\n%s', lat_lons)
         with res_cls(res_file, **res_kwargs) as f:
             gids = f.lat_lon_gid(lat_lons)  # pylint: disable=no-member
 
@@ -903,7 +1103,7 @@ class ProjectPoints:
 
             gids = gids.tolist()
 
-        logger.debug('- Resource gids:\n{}'.format(gids))
+        logger.debug('- Resource gids:\n%s', gids)
 
         pp = cls(gids, sam_config, tech=tech, res_file=res_file,
                  curtailment=curtailment)
@@ -965,10 +1165,10 @@ class ProjectPoints:
         with res_cls(res_file, hsds=hsds) as f:
             meta = f.meta
             for region, region_col in regions.items():
-                logger.debug('- {}: {}'.format(region_col, region))
+                logger.debug('- %s: %s', region_col, region)
                 # pylint: disable=no-member
                 gids = f.region_gids(region, region_col=region_col)
-                logger.debug('- Resource gids:\n{}'.format(gids))
+                logger.debug('- Resource gids:\n%s', gids)
                 if points:
                     duplicates = np.intersect1d(gids, points).tolist()
                     if duplicates:
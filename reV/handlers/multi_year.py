@@ -2,6 +2,9 @@
 """
 Classes to collect reV outputs from multiple annual files.
 """
+from functools import lru_cache
+import h5py
+import hashlib
 import logging
 import numpy as np
 import os
@@ -12,8 +15,97 @@ from reV.utilities.exceptions import HandlerRuntimeError
 
 from rex.utilities.utilities import parse_year, get_lat_lon_cols
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# HDF5 and h5py filters that are always available (szip may be missing)
+BUILTIN_FILTERS = frozenset((h5py.h5z.FILTER_DEFLATE, h5py.h5z.FILTER_SHUFFLE,
+                             h5py.h5z.FILTER_FLETCHER32,
+                             h5py.h5z.FILTER_NBIT,
+                             h5py.h5z.FILTER_SCALEOFFSET,
+                             h5py.h5z.FILTER_LZF))
+
+
+def _welford_update(data, mean, m2, count):
+    """
+    Update running mean and sum of squared differences in place with the
+    count-th sample (Welford's online algorithm)
+
+    Parameters
+    ----------
+    data : ndarray
+        New sample, 1D float32 array
+    mean : ndarray
+        Running mean, updated in place
+    m2 : ndarray
+        Running sum of squared differences from the mean, updated in place
+    count : int
+        Number of samples including data
+    """
+    delta = data - mean
+    mean += delta / count
+    m2 += delta * (data - mean)
+
+
+def _coords_digest(coords):
+    """
+    Hash a coordinate array so it can be compared in O(1)
+
+    Parameters
+    ----------
+    coords : ndarray
+        (n_sites, 2) array of (latitude, longitude) coordinates
+
+    Returns
+    -------
+    bytes
+        blake2b digest of the float64 coordinate bytes
+    """
+    coords = np.ascontiguousarray(coords, dtype='float64')
+
+    return hashlib.blake2b(coords.tobytes(), digest_size=16).digest()
+
+
+@lru_cache(maxsize=256)
+def _source_coords_digest(source_h5, mtime_ns):
+    """
+    Coordinate digest of a source .h5 file, cached per file version so
+    that each source meta is only read once when collecting many datasets
+
+    Parameters
+    ----------
+    source_h5 : str
+        Path to source .h5 file
+    mtime_ns : int
+        Modification time of source_h5, part of the cache key
+
+    Returns
+    -------
+    bytes
+        blake2b digest of the source coordinates
+    """
+    with h5py.File(source_h5, mode='r') as f:
+        coords = MultiYear._get_coords(f['meta'])
+
+    return _coords_digest(coords)
+
+
+if numba is not None:
+    # serial kernel: reV parallelizes at the process level (pool workers,
+    # concurrent node jobs), a numba thread pool per process would
+    # oversubscribe the cores
+    @numba.njit(cache=True)
+    def _welford_update(data, mean, m2, count):  # noqa: F811
+        """Numba compiled version of _welford_update"""
+        for i in range(data.shape[0]):
+            delta = data[i] - mean[i]
+            mean[i] += delta / count
+            m2[i] += delta * (data[i] - mean[i])
+
 
 class MultiYear(Outputs):
     """
@@ -25,7 +117,7 @@ class MultiYear(Outputs):
 
     """
     def __init__(self, h5_file, group=None, unscale=True, mode='r',
-                 str_decode=True):
+                 str_decode=True, rdcc_nbytes=None, rdcc_nslots=None):
         """
         Parameters
         ----------
@@ -40,9 +132,17 @@ class MultiYear(Outputs):
         str_decode : bool
             Boolean flag to decode the bytestring meta data into normal
             strings. Setting this to False will speed up the meta data read.
+        rdcc_nbytes : int | None
+            Size in bytes of the raw data chunk cache per dataset, None for
+            the h5py default
+        rdcc_nslots : int | None
+            Number of hash slots in the raw data chunk cache, None for the
+            h5py default
         """
         super().__init__(h5_file, group=group, unscale=unscale, mode=mode,
-                         str_decode=str_decode)
+                         str_decode=str_decode, rdcc_nbytes=rdcc_nbytes,
+                         rdcc_nslots=rdcc_nslots)
+        self._dset_props = {}
 
     @staticmethod
     def _create_dset_name(source_h5, dset):
@@ -77,7 +177,7 @@ class MultiYear(Outputs):
             Path to source .h5 file to copy data from
         """
         dset_out = self._create_dset_name(source_h5, 'time_index')
-        if dset_out not in self.datasets:
+        if dset_out not in self._dsets_set:
             logger.debug("- Collecting time_index from {}"
                          .format(os.path.basename(source_h5)))
             with Outputs(source_h5, mode='r') as f_in:
@@ -86,7 +186,51 @@ class MultiYear(Outputs):
             self._create_dset(dset_out, time_index.shape, time_index.dtype,
                               data=time_index)
 
-    def _copy_dset(self, source_h5, dset, meta=None, pass_through=False):
+    @staticmethod
+    def _get_coords(meta):
+        """
+        Extract the (latitude, longitude) coordinates from a meta data
+        records array without building a DataFrame.
+
+        Parameters
+        ----------
+        meta : ndarray | h5py.Dataset
+            Meta data records array or h5py meta Dataset, in which case only
+            the coordinate fields are read from disk
+
+        Returns
+        -------
+        coords : ndarray
+            (n_sites, 2) array of (latitude, longitude) coordinates
+        """
+        cols = get_lat_lon_cols(pd.DataFrame(columns=meta.dtype.names))
+        coords = np.column_stack([meta[c] for c in cols])
+
+        return coords
+
+    @staticmethod
+    def _check_coords(source_h5, coords, source_meta):
+        """
+        Check that the source meta coordinates match coords, comparing
+        cached digests first and the full arrays only on a digest mismatch
+
+        Parameters
+        ----------
+        source_h5 : str
+            Path to source .h5 file
+        coords : ndarray
+            (n_sites, 2) array of expected (latitude, longitude) coordinates
+        source_meta : h5py.Dataset
+            Source meta dataset
+        """
+        mtime_ns = os.stat(source_h5).st_mtime_ns
+        source_digest = _source_coords_digest(source_h5, mtime_ns)
+        if source_digest != _coords_digest(coords):
+            source_coords = MultiYear._get_coords(source_meta)
+            if not np.array_equal(coords, source_coords, equal_nan=True):
+                raise HandlerRuntimeError('Coordinates do not match')
+
+    def _copy_dset(self, source_h5, dset, coords=None, pass_through=False):
         """
         Copy dset_in from source_h5 to multiyear .h5
 
@@ -96,8 +240,9 @@ class MultiYear(Outputs):
             Path to source .h5 file to copy data from
         dset : str
             Dataset to copy
-        meta : pandas.DataFrame
-            If provided confirm that source meta matches given meta
+        coords : ndarray
+            If provided confirm that source meta coordinates match the given
+            (n_sites, 2) array of (latitude, longitude) coordinates
         pass_through : bool
             Flag to just pass through dataset without name modifications
             (no differences between years, no means or stdevs)
@@ -107,22 +252,123 @@ class MultiYear(Outputs):
         else:
             dset_out = self._create_dset_name(source_h5, dset)
 
-        if dset_out not in self.datasets:
+        if dset_out not in self._dsets_set:
             logger.debug("- Collecting {} from {}"
                          .format(dset, os.path.basename(source_h5)))
             with Outputs(source_h5, unscale=False, mode='r') as f_in:
-                if meta is not None:
-                    cols = get_lat_lon_cols(meta)
-                    source_meta = f_in.meta
-                    if not meta[cols].equals(source_meta[cols]):
-                        raise HandlerRuntimeError('Coordinates do not match')
+                if coords is not None:
+                    self._check_coords(source_h5, coords, f_in.h5['meta'])
 
-                _, ds_dtype, ds_chunks = f_in.get_dset_properties(dset)
+                ds_shape, ds_dtype, ds_chunks = f_in.get_dset_properties(dset)
                 ds_attrs = f_in.get_attrs(dset=dset)
-                ds_data = f_in[dset]
+                self._dset_props[dset_out] = (ds_dtype, ds_chunks, ds_attrs)
+                ds_in = f_in.h5[dset]
+                if self._builtin_filters(ds_in):
+                    # reuse the source creation properties so that the
+                    # output has the same filter pipeline and fill value
+                    kwargs = {'dcpl': ds_in.id.get_create_plist()}
+                else:
+                    # plugin filters (reported by h5py as compression None
+                    # or 'unknown') may not be available for writing, the
+                    # data is decoded and written without compression
+                    kwargs = {}
+
+                self._create_dset(dset_out, ds_shape, ds_dtype,
+                                  chunks=ds_chunks, attrs=ds_attrs, **kwargs)
+
+                ds_out = self.h5[dset_out]
+                if self._same_layout(ds_in, ds_out):
+                    self._copy_chunks(ds_in, ds_out)
+                else:
+                    for ds_slice in self._get_slab_slices(ds_out):
+                        ds_out[ds_slice] = ds_in[ds_slice]
+
+    @staticmethod
+    def _get_filters(ds):
+        """
+        Get the full filter pipeline of an h5py dataset from its creation
+        property list. Unlike the h5py Dataset properties this includes
+        plugin filters (e.g. blosc, bitshuffle, lz4).
+
+        Parameters
+        ----------
+        ds : h5py.Dataset
+            Dataset to get filters for
+
+        Returns
+        -------
+        filters : tuple
+            (filter code, flags, client values) for each filter in the
+            pipeline, in order
+        """
+        dcpl = ds.id.get_create_plist()
+
+        return tuple(dcpl.get_filter(i)[:3]
+                     for i in range(dcpl.get_nfilters()))
+
+    @classmethod
+    def _builtin_filters(cls, ds):
+        """
+        Check if all filters of an h5py dataset are built into HDF5/h5py and
+        can therefore always be recreated on an output dataset.
+
+        Parameters
+        ----------
+        ds : h5py.Dataset
+            Dataset to check
+
+        Returns
+        -------
+        bool
+            True if the dataset has no plugin filters
+        """
+        return all(f[0] in BUILTIN_FILTERS for f in cls._get_filters(ds))
+
+    @classmethod
+    def _same_layout(cls, ds_in, ds_out):
+        """
+        Check if two h5py datasets share the same chunked on-disk layout so
+        that chunks can be copied between them without decoding.
+
+        Parameters
+        ----------
+        ds_in : h5py.Dataset
+            Source dataset
+        ds_out : h5py.Dataset
+            Destination dataset
+
+        Returns
+        -------
+        bool
+            True if both datasets are chunked with identical shape, dtype,
+            chunks, filter pipeline and fill value
+        """
+        props = ('shape', 'dtype', 'chunks', 'fillvalue')
+
+        return (ds_in.chunks is not None
+                and all(getattr(ds_in, p) == getattr(ds_out, p)
+                        for p in props)
+                and cls._get_filters(ds_in) == cls._get_filters(ds_out))
+
+    @staticmethod
+    def _copy_chunks(ds_in, ds_out):
+        """
+        Copy the raw (still compressed) chunks of ds_in into ds_out, skipping
+        the decompress/recompress round trip. Datasets must have the same
+        layout, see _same_layout.
 
-            self._create_dset(dset_out, ds_data.shape, ds_dtype,
-                              chunks=ds_chunks, attrs=ds_attrs, data=ds_data)
+        Parameters
+        ----------
+        ds_in : h5py.Dataset
+            Source dataset
+        ds_out : h5py.Dataset
+            Destination dataset
+        """
+        for i in range(ds_in.id.get_num_chunks()):
+            offset = ds_in.id.get_chunk_info(i).chunk_offset
+            filter_mask, chunk = ds_in.id.read_direct_chunk(offset)
+            ds_out.id.write_direct_chunk(offset, chunk,
+                                         filter_mask=filter_mask)
 
     def collect(self, source_files, dset, profiles=False, pass_through=False):
         """
@@ -142,21 +388,33 @@ class MultiYear(Outputs):
             Flag to just pass through dataset without name modifications
             (no differences between years, no means or stdevs)
         """
-        with Outputs(source_files[0], mode='r') as f_in:
-            meta = f_in.h5['meta'][...]
-
-        if 'meta' not in self.datasets:
+        if 'meta' not in self._dsets_set:
             logger.debug("Copying meta")
+            with Outputs(source_files[0], mode='r') as f_in:
+                meta = f_in.h5['meta'][...]
+
             self._create_dset('meta', meta.shape, meta.dtype,
                               data=meta)
+            coords = self._get_coords(meta)
+        else:
+            coords = self._get_coords(self.h5['meta'])
 
-        meta = pd.DataFrame(meta)
+        collected = set(self.datasets)
         for year_h5 in source_files:
             if profiles:
-                self._copy_time_index(year_h5)
+                ti_out = self._create_dset_name(year_h5, 'time_index')
+                if ti_out not in collected:
+                    self._copy_time_index(year_h5)
 
-            self._copy_dset(year_h5, dset, meta=meta,
-                            pass_through=pass_through)
+            if pass_through:
+                dset_out = dset
+            else:
+                dset_out = self._create_dset_name(year_h5, dset)
+
+            if dset_out not in collected:
+                self._copy_dset(year_h5, dset, coords=coords,
+                                pass_through=pass_through)
+                collected.add(dset_out)
 
     def _get_source_dsets(self, dset_out):
         """
@@ -182,6 +440,129 @@ class MultiYear(Outputs):
 
         return source_dsets
 
+    def _get_chunk_slices(self, dset, chunk_size=None):
+        """
+        Get slices along the first axis of dset that are aligned with the
+        dataset's chunks so it can be read one block at a time.
+
+        Parameters
+        ----------
+        dset : str
+            Dataset to get slices for
+        chunk_size : int | None
+            Number of rows per slice, if None use the dataset chunk size
+            (or 2**16 rows if the dataset is not chunked)
+
+        Returns
+        -------
+        slices : list
+            List of slice objects covering the first axis of dset
+        """
+        ds = self.h5[dset]
+        if chunk_size is None:
+            chunk_size = ds.chunks[0] if ds.chunks else 2**16
+
+        n = ds.shape[0]
+        slices = [slice(i, min(i + chunk_size, n))
+                  for i in range(0, n, chunk_size)]
+
+        return slices
+
+    def _get_unscale(self, dset):
+        """
+        Get the unscaling parameters of dset and the dtype to read it into
+
+        Parameters
+        ----------
+        dset : str
+            Dataset to read
+
+        Returns
+        -------
+        scale_factor : int | float
+            Dataset scale factor, 1 if not unscaling
+        adder : int | float
+            Dataset add offset, 0 if not unscaling
+        dtype : np.dtype
+            Float dtype to read the data into: the source dtype for float
+            data, float32 for scaled integer data, and float64 otherwise
+        """
+        scale_factor, adder = 1, 0
+        if self._unscale:
+            scale_factor = self.get_scale(dset)
+            adder = self.get_attrs(dset=dset).get(self.ADD_ATTR, 0)
+
+        dtype = self.h5[dset].dtype
+        if not np.issubdtype(dtype, np.floating):
+            scaled = scale_factor != 1 or adder != 0
+            dtype = np.dtype('float32' if scaled else 'float64')
+
+        return scale_factor, adder, dtype
+
+    def _iter_chunks(self, dset):
+        """
+        Iterate over dset in chunk-aligned blocks of rows, reading each block
+        directly into a single reused float buffer and unscaling it in
+        place the same way rex does (see rex_unscale).
+
+        Parameters
+        ----------
+        dset : str
+            Dataset to read
+
+        Yields
+        ------
+        ds_slice : slice
+            Rows of dset in the current block
+        data : ndarray
+            Unscaled float data for ds_slice, see _get_unscale for the
+            dtype. This is a view of the reused buffer and is overwritten by
+            the next block.
+        """
+        ds = self.h5[dset]
+        scale_factor, adder, dtype = self._get_unscale(dset)
+        slices = self._get_chunk_slices(dset)
+        if slices:
+            buffer = np.empty(slices[0].stop - slices[0].start, dtype=dtype)
+
+        for ds_slice in slices:
+            n = ds_slice.stop - ds_slice.start
+            ds.read_direct(buffer, source_sel=ds_slice, dest_sel=np.s_[:n])
+            data = buffer[:n]
+            if adder != 0:
+                data *= scale_factor
+                data += adder
+            elif scale_factor != 1:
+                data /= scale_factor
+
+            yield ds_slice, data
+
+    def _get_dset_props(self, dset):
+        """
+        Get the dtype, chunks, and attributes of a dataset in the multi-year
+        file, cached per dataset (annual datasets are cached on collection)
+
+        Parameters
+        ----------
+        dset : str
+            Dataset name
+
+        Returns
+        -------
+        ds_dtype : str
+            Dataset dtype
+        ds_chunks : tuple
+            Dataset chunk size
+        ds_attrs : dict
+            Dataset attributes
+        """
+        if dset not in self._dset_props:
+            _, ds_dtype, ds_chunks = self.get_dset_properties(dset)
+            ds_attrs = self.get_attrs(dset=dset)
+            self._dset_props[dset] = (ds_dtype, ds_chunks, ds_attrs)
+
+        return self._dset_props[dset]
+
     def _update_dset(self, dset_out, dset_data):
         """
         Update dataset, create if needed
@@ -193,14 +574,13 @@ class MultiYear(Outputs):
         dset_data : ndarray
             Dataset data to write to disc
         """
-        if dset_out in self.datasets:
+        if dset_out in self._dsets_set:
             logger.debug("- Updating {}".format(dset_out))
             self[dset_out] = dset_data
         else:
             logger.debug("- Creating {}".format(dset_out))
             source_dset = self._get_source_dsets(dset_out)[0]
-            _, ds_dtype, ds_chunks = self.get_dset_properties(source_dset)
-            ds_attrs = self.get_attrs(dset=source_dset)
+            ds_dtype, ds_chunks, ds_attrs = self._get_dset_props(source_dset)
             self._add_dset(dset_out, dset_data, ds_dtype,
                            chunks=ds_chunks, attrs=ds_attrs)
 
@@ -224,12 +604,14 @@ class MultiYear(Outputs):
         my_means = np.zeros(len(self), dtype='float32')
         for ds in source_dsets:
             if self.h5[ds].shape == my_means.shape:
-                my_means += self[ds]
+                for ds_slice, data in self._iter_chunks(ds):
+                    my_means[ds_slice] += data
             else:
                 raise HandlerRuntimeError("{} shape {} should be {}"
                                           .format(ds, self.h5[ds].shape,
                                                   my_means.shape))
-        my_means /= len(source_dsets)
+
+        np.divide(my_means, len(source_dsets), out=my_means)
         self._update_dset(dset_out, my_means)
 
         return my_means
@@ -249,7 +631,7 @@ class MultiYear(Outputs):
             Array of multi-year means for dataset of interest
         """
         my_dset = "{}-means".format(dset)
-        if my_dset in self.datasets:
+        if my_dset in self._dsets_set:
             my_means = self[my_dset]
         else:
             my_means = self._compute_means(my_dset)
@@ -278,19 +660,67 @@ class MultiYear(Outputs):
         source_dsets = self._get_source_dsets(dset_out)
 
         my_stdev = np.zeros(means.shape, dtype='float32')
+        means = np.asarray(means, dtype='float32')
         for ds in source_dsets:
             if self.h5[ds].shape == my_stdev.shape:
-                my_stdev += (self[ds] - means)**2
+                for ds_slice, diff in self._iter_chunks(ds):
+                    diff -= means[ds_slice]
+                    my_stdev[ds_slice] += diff * diff
             else:
                 raise HandlerRuntimeError("{} shape {} should be {}"
                                           .format(ds, self.h5[ds].shape,
                                                   my_stdev.shape))
 
-        my_stdev = np.sqrt(my_stdev / len(source_dsets))
+        np.divide(my_stdev, len(source_dsets), out=my_stdev)
+        np.sqrt(my_stdev, out=my_stdev)
         self._update_dset(dset_out, my_stdev)
 
         return my_stdev
 
+    def _compute_means_stdev(self, dset_out_means, dset_out_stdev):
+        """
+        Compute multi-year means and standard deviations for given dataset
+        in a single pass over the annual datasets using Welford's algorithm
+
+        Parameters
+        ----------
+        dset_out_means : str
+            Multi-year means dataset name
+        dset_out_stdev : str
+            Multi-year stdev dataset name
+
+        Returns
+        -------
+        my_means : ndarray
+            Array of multi-year means
+        my_stdev : ndarray
+            Array of multi-year standard deviations
+        """
+        source_dsets = self._get_source_dsets(dset_out_means)
+        logger.debug('\t- Computing {} and {} from {}'
+                     .format(dset_out_means, dset_out_stdev, source_dsets))
+
+        my_means = np.zeros(len(self), dtype='float32')
+        my_m2 = np.zeros(my_means.shape, dtype='float32')
+        for count, ds in enumerate(source_dsets, start=1):
+            if self.h5[ds].shape != my_means.shape:
+                raise HandlerRuntimeError("{} shape {} should be {}"
+                                          .format(ds, self.h5[ds].shape,
+                                                  my_means.shape))
+
+            for ds_slice, data in self._iter_chunks(ds):
+                _welford_update(data, my_means[ds_slice], my_m2[ds_slice],
+                                count)
+
+        # guard against small negative round-off in the sum of squares
+        np.maximum(my_m2, 0, out=my_m2)
+        my_stdev = np.divide(my_m2, len(source_dsets), out=my_m2)
+        np.sqrt(my_stdev, out=my_stdev)
+        self._update_dset(dset_out_means, my_means)
+        self._update_dset(dset_out_stdev, my_stdev)
+
+        return my_means, my_stdev
+
     def stdev(self, dset):
         """
         Extract or compute multi-year standard deviation for given source dset
@@ -306,7 +736,7 @@ class MultiYear(Outputs):
             Array of multi-year standard deviation for dataset of interest
         """
         my_dset = "{}-stdev".format(dset)
-        if my_dset in self.datasets:
+        if my_dset in self._dsets_set:
             my_stdev = self[my_dset]
         else:
             my_means = self.means(dset)
@@ -379,7 +809,9 @@ class MultiYear(Outputs):
         """
         logger.info('Passing through {} into {}.'
                     .format(dset, my_file))
-        with cls(my_file, mode='a', group=group) as my:
+        with cls(my_file, mode='a', group=group,
+                 rdcc_nbytes=cls.BULK_RDCC_NBYTES,
+                 rdcc_nslots=cls.BULK_RDCC_NSLOTS) as my:
             my.collect(source_files, dset, pass_through=True)
 
     @classmethod
@@ -401,10 +833,12 @@ class MultiYear(Outputs):
         logger.info('Collecting {} into {} '
                     'and computing multi-year means and standard deviations.'
                     .format(dset, my_file))
-        with cls(my_file, mode='a', group=group) as my:
+        with cls(my_file, mode='a', group=group,
+                 rdcc_nbytes=cls.BULK_RDCC_NBYTES,
+                 rdcc_nslots=cls.BULK_RDCC_NSLOTS) as my:
             my.collect(source_files, dset)
-            means = my._compute_means("{}-means".format(dset))
-            my._compute_stdev("{}-stdev".format(dset), means=means)
+            my._compute_means_stdev("{}-means".format(dset),
+                                    "{}-stdev".format(dset))
 
     @classmethod
     def collect_profiles(cls, my_file, source_files, dset, group=None):
@@ -423,5 +857,7 @@ class MultiYear(Outputs):
             Group to collect datasets into
         """
         logger.info('Collecting {} into {}'.format(dset, my_file))
-        with cls(my_file, mode='a', group=group) as my:
+        with cls(my_file, mode='a', group=group,
+                 rdcc_nbytes=cls.BULK_RDCC_NBYTES,
+                 rdcc_nslots=cls.BULK_RDCC_NSLOTS) as my:
             my.collect(source_files, dset, profiles=True)
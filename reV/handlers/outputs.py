@@ -134,8 +134,14 @@ class Outputs(Resource):
     spatial shape: (100,)
     """
 
+    # Raw data chunk cache for bulk profile writes and collection. Not the
+    # default because the cache is allocated per open dataset per process.
+    BULK_RDCC_NBYTES = 128 * 1024**2
+    BULK_RDCC_NSLOTS = 100003
+
     def __init__(self, h5_file, mode='r', unscale=True, str_decode=True,
-                 group=None):
+                 group=None, rdcc_nbytes=None, rdcc_nslots=None,
+                 libver=None):
         """
         Parameters
         ----------
@@ -150,29 +156,46 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        rdcc_nbytes : int | None
+            Size in bytes of the raw data chunk cache per dataset. None uses
+            the small h5py default, which forces chunks to be re-read
+            whenever a slab spans more chunks than fit in the cache, e.g.
+            all sites of a (None, 100) chunked profiles dataset. Bulk
+            profile write paths pass BULK_RDCC_NBYTES.
+        rdcc_nslots : int | None
+            Number of hash slots in the raw data chunk cache, should be a
+            prime number much larger than the number of cached chunks.
+            None uses the h5py default.
+        libver : str | tuple | None
+            HDF5 library version bounds passed to h5py.File, e.g. 'latest'
+            to use the newest (faster) metadata structures. Files written
+            with 'latest' may not be readable by older HDF5 versions.
+            None uses the h5py default.
         """
         self._h5_file = h5_file
-        self._h5 = h5py.File(h5_file, mode=mode)
+        self._h5 = h5py.File(h5_file, mode=mode, rdcc_nbytes=rdcc_nbytes,
+                             rdcc_nslots=rdcc_nslots, libver=libver)
         self._unscale = unscale
         self._mode = mode
         self._meta = None
         self._time_index = None
         self._str_decode = str_decode
         self._group = self._check_group(group)
+        self._datasets = None
 
         if self.writable:
             self.set_version_attr()
 
     def __len__(self):
         _len = 0
-        if 'meta' in self.datasets:
+        if 'meta' in self._dsets_set:
             _len = self.h5['meta'].shape[0]
 
         return _len
 
     def __getitem__(self, keys):
         ds, ds_slice = parse_keys(keys)
-        if ds in self.datasets:
+        if ds in self._dsets_set:
             if ds.endswith('time_index'):
                 out = self._get_time_index(ds, ds_slice)
             elif ds.endswith('meta'):
@@ -251,7 +274,7 @@ class Outputs(Resource):
             shape of variables arrays == (time, locations)
         """
         _shape = None
-        dsets = self.datasets
+        dsets = self._dsets_set
         if 'meta' in dsets:
             _shape = self.h5['meta'].shape
             if 'time_index' in dsets:
@@ -259,6 +282,44 @@ class Outputs(Resource):
 
         return _shape
 
+    def _get_dset_cache(self):
+        """
+        Get the cached dataset names, refreshing them after a dataset is
+        created or replaced through this handler
+
+        Returns
+        -------
+        datasets : tuple
+            Immutable tuple of (ordered names, frozenset of names)
+        """
+        if self._datasets is None:
+            names = tuple(super().datasets)
+            self._datasets = (names, frozenset(names))
+
+        return self._datasets
+
+    @property
+    def _dsets_set(self):
+        """
+        Set of available datasets for O(1) membership checks
+
+        Returns
+        -------
+        frozenset
+        """
+        return self._get_dset_cache()[1]
+
+    @property
+    def datasets(self):
+        """
+        Datasets available
+
+        Returns
+        -------
+        list
+        """
+        return list(self._get_dset_cache()[0])
+
     @property
     def writable(self):
         """
@@ -310,7 +371,7 @@ class Outputs(Resource):
         configs : dict
             Dictionary of SAM configuration JSONs
         """
-        if 'meta' in self.datasets:
+        if 'meta' in self._dsets_set:
             configs = {k: json.loads(v)
                        for k, v in self.h5['meta'].attrs.items()}
         else:
@@ -381,7 +442,7 @@ class Outputs(Resource):
         if isinstance(meta, pd.DataFrame):
             meta = to_records_array(meta)
 
-        if ds in self.datasets:
+        if ds in self._dsets_set:
             self.update_dset(ds, meta)
         else:
             self._create_dset(ds, meta.shape, meta.dtype, data=meta,
@@ -406,7 +467,7 @@ class Outputs(Resource):
             dtype = "S{}".format(len(time_index[0]))
             time_index = np.array(time_index, dtype=dtype)
 
-        if ds in self.datasets:
+        if ds in self._dsets_set:
             self.update_dset(ds, time_index)
         else:
             self._create_dset(ds, time_index.shape, time_index.dtype,
@@ -426,7 +487,7 @@ class Outputs(Resource):
         config : dict
             SAM config JSON as a dictionary
         """
-        if 'meta' in self.datasets:
+        if 'meta' in self._dsets_set:
             config = json.loads(self.h5['meta'].attrs[config_name])
         else:
             config = None
@@ -478,12 +539,15 @@ class Outputs(Resource):
                                           'scale "{}" data to "{}".'
                                           .format(data.dtype, dtype))
 
-            # apply scale factor and dtype
-            data = np.multiply(data, scale_factor)
+            # apply scale factor and dtype without intermediate copies
             if np.issubdtype(dtype, np.integer):
-                data = np.round(data)
-
-            data = data.astype(dtype)
+                scaled = np.multiply(data, scale_factor)
+                np.round(scaled, out=scaled)
+                data = scaled.astype(dtype, copy=False)
+            else:
+                out = np.empty(data.shape, dtype=dtype)
+                data = np.multiply(data, scale_factor, out=out,
+                                   casting='unsafe')
 
         return data
 
@@ -500,7 +564,7 @@ class Outputs(Resource):
         ds_slice : tuple
             Dataset slicing that corresponds to arr
         """
-        if ds_name not in self.datasets:
+        if ds_name not in self._dsets_set:
             msg = '{} must be initialized!'.format(ds_name)
             raise HandlerRuntimeError(msg)
 
@@ -510,7 +574,73 @@ class Outputs(Resource):
         self.h5[ds_name][ds_slice] = self._check_data_dtype(arr, dtype,
                                                             scale_factor)
 
-    def _check_chunks(self, chunks, data=None):
+    @staticmethod
+    def _get_auto_chunks(shape, dtype, chunk_size=2**20):
+        """
+        Get a chunk shape for a 2D (time, sites) dataset that holds the full
+        time series for as many sites as fit in ~chunk_size bytes (1 MiB by
+        default, the size of the default HDF5 chunk cache).
+
+        Parameters
+        ----------
+        shape : tuple
+            2D dataset shape (time, sites)
+        dtype : str | np.dtype
+            Dataset numpy dtype
+        chunk_size : int
+            Target chunk size in bytes
+
+        Returns
+        -------
+        ds_chunks : tuple
+            dataset chunk size
+        """
+        col_size = shape[0] * np.dtype(dtype).itemsize
+        chunk_1 = int(min(shape[1], max(1, chunk_size // col_size)))
+
+        return (shape[0], chunk_1)
+
+    @staticmethod
+    def _get_slab_slices(ds, slab_size=2**26):
+        """
+        Get chunk aligned slices to read or write an h5py dataset one slab
+        of ~slab_size bytes at a time. Chunked datasets are split along the
+        last (sites) axis in whole chunk widths, contiguous datasets in
+        blocks of rows.
+
+        Parameters
+        ----------
+        ds : h5py.Dataset
+            Dataset to split into slabs
+        slab_size : int
+            Target size in bytes of each slab
+
+        Returns
+        -------
+        slices : list
+            List of tuples of slice objects covering ds
+        """
+        if ds.chunks:
+            axis = ds.ndim - 1
+            chunk = ds.chunks[axis]
+        else:
+            axis = 0
+            chunk = 1
+
+        line_size = ds.dtype.itemsize * int(np.prod(ds.shape)
+                                            // max(1, ds.shape[axis]))
+        step = max(1, slab_size // max(1, line_size * chunk)) * chunk
+
+        n = ds.shape[axis]
+        slices = []
+        for i in range(0, n, step):
+            ds_slice = [slice(None)] * ds.ndim
+            ds_slice[axis] = slice(i, min(i + step, n))
+            slices.append(tuple(ds_slice))
+
+        return slices
+
+    def _check_chunks(self, chunks, data=None, shape=None, dtype=None):
         """
         Convert dataset chunk size into valid tuple based on variable array
         shape
@@ -520,36 +650,35 @@ class Outputs(Resource):
             Desired dataset chunk size
         data : ndarray
             Dataset array being chunked
+        shape : tuple
+            Shape of the dataset being chunked, takes precedence over data
+        dtype : str | np.dtype
+            Dataset numpy dtype. If provided and chunks is None, 2D datasets
+            are given a ~1 MiB chunk shape instead of a contiguous layout.
 
         Returns
         -------
         ds_chunks : tuple
             dataset chunk size
         """
-        if chunks is not None:
-            if data is not None:
-                shape = data.shape
-            else:
-                shape = self.shape
-
-            if chunks[0] is None:
-                chunk_0 = shape[0]
-            else:
-                chunk_0 = np.min((shape[0], chunks[0]))
-
-            if chunks[1] is None:
-                chunk_1 = shape[1]
-            else:
-                chunk_1 = np.min((shape[1], chunks[1]))
+        if shape is None and data is not None:
+            shape = data.shape
+        elif shape is None:
+            shape = self.shape
 
-            ds_chunks = (chunk_0, chunk_1)
+        if chunks is not None:
+            ds_chunks = tuple(n if c is None else np.min((n, c))
+                              for n, c in zip(shape, chunks))
+        elif dtype is not None and len(shape or ()) == 2 and all(shape):
+            ds_chunks = self._get_auto_chunks(shape, dtype)
         else:
             ds_chunks = None
 
         return ds_chunks
 
     def _create_dset(self, ds_name, shape, dtype, chunks=None, attrs=None,
-                     data=None, replace=True):
+                     data=None, replace=True, compression=None,
+                     compression_opts=None, shuffle=False, dcpl=None):
         """
         Initialize dataset
 
@@ -569,12 +698,24 @@ class Outputs(Resource):
             Dataset data array
         replace : bool
             If previous dataset exists with the same name, it will be replaced.
+        compression : str | None
+            h5py compression filter, e.g. 'gzip', None for no compression
+        compression_opts : int | None
+            Compression filter settings, e.g. gzip level
+        shuffle : bool
+            Flag to apply the byte shuffle filter before compression
+        dcpl : h5py.h5p.PropDCID | None
+            Dataset creation property list to create the dataset from, e.g.
+            a copy of another dataset's, to reuse its filter pipeline. Should
+            not be combined with compression or shuffle, which would add
+            those filters a second time.
         """
         if self.writable:
-            if ds_name in self.datasets and replace:
+            if ds_name in self._dsets_set and replace:
                 del self.h5[ds_name]
+                self._datasets = None
 
-            elif ds_name in self.datasets:
+            elif ds_name in self._dsets_set:
                 old_shape, old_dtype, _ = self.get_dset_properties(ds_name)
                 if old_shape != shape or old_dtype != dtype:
                     e = ('Trying to create dataset "{}", but already exists '
@@ -584,10 +725,15 @@ class Outputs(Resource):
                     logger.error(e)
                     raise HandlerRuntimeError(e)
 
-            if ds_name not in self.datasets:
-                chunks = self._check_chunks(chunks, data=data)
+            if ds_name not in self._dsets_set:
+                chunks = self._check_chunks(chunks, data=data, shape=shape,
+                                            dtype=dtype)
                 ds = self.h5.create_dataset(ds_name, shape=shape, dtype=dtype,
-                                            chunks=chunks)
+                                            chunks=chunks,
+                                            compression=compression,
+                                            compression_opts=compression_opts,
+                                            shuffle=shuffle, dcpl=dcpl)
+                self._datasets = None
 
             if attrs is not None:
                 for key, value in attrs.items():
@@ -627,7 +773,8 @@ class Outputs(Resource):
                 raise HandlerRuntimeError("'meta' and 'time_index' have not "
                                           "been loaded")
 
-    def _add_dset(self, dset_name, data, dtype, chunks=None, attrs=None):
+    def _add_dset(self, dset_name, data, dtype, chunks=None, attrs=None,
+                  compression=None, compression_opts=None, shuffle=False):
         """
         Write dataset to disk. Dataset it created in .h5 file and data is
         scaled if needed.
@@ -644,6 +791,12 @@ class Outputs(Resource):
             Chunk size for capacity factor means dataset.
         attrs : dict
             Attributes to be set. May include 'scale_factor'.
+        compression : str | None
+            h5py compression filter, e.g. 'gzip', None for no compression
+        compression_opts : int | None
+            Compression filter settings, e.g. gzip level
+        shuffle : bool
+            Flag to apply the byte shuffle filter before compression
         """
         self._check_dset_shape(data)
 
@@ -652,10 +805,24 @@ class Outputs(Resource):
         else:
             scale_factor = 1
 
-        data = self._check_data_dtype(data, dtype, scale_factor=scale_factor)
+        # check the scaling up front so that a bad dtype does not leave an
+        # empty dataset behind
+        data = np.asarray(data)
+        self._check_data_dtype(data[:0], dtype, scale_factor=scale_factor)
 
         self._create_dset(dset_name, data.shape, dtype,
-                          chunks=chunks, attrs=attrs, data=data)
+                          chunks=chunks, attrs=attrs,
+                          compression=compression,
+                          compression_opts=compression_opts,
+                          shuffle=shuffle)
+
+        if self.writable:
+            # scale and write one chunk aligned slab at a time so the scaled
+            # copy of data never has to exist in full
+            ds = self.h5[dset_name]
+            for ds_slice in self._get_slab_slices(ds):
+                ds[ds_slice] = self._check_data_dtype(data[ds_slice], dtype,
+                                                      scale_factor)
 
     def update_dset(self, dset, dset_array, dset_slice=None):
         """
@@ -703,7 +870,9 @@ class Outputs(Resource):
     @classmethod
     def write_profiles(cls, h5_file, meta, time_index, dset_name, profiles,
                        attrs, dtype, SAM_configs=None, chunks=(None, 100),
-                       unscale=True, mode='w-', str_decode=True, group=None):
+                       unscale=True, mode='w-', str_decode=True, group=None,
+                       compression='gzip', compression_opts=None,
+                       shuffle=True):
         """
         Write profiles to disk
 
@@ -736,6 +905,13 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        compression : str | None
+            h5py compression filter for the profiles dataset, None for no
+            compression
+        compression_opts : int | None
+            Compression filter settings, e.g. gzip level
+        shuffle : bool
+            Flag to apply the byte shuffle filter before compression
         """
         logger.info("Saving profiles ({}) to {}".format(dset_name, h5_file))
         if profiles.shape != (len(time_index), len(meta)):
@@ -743,7 +919,8 @@ class Outputs(Resource):
                                     "'time_index' and 'meta'")
         ts = time.time()
         kwargs = {"unscale": unscale, "mode": mode, "str_decode": str_decode,
-                  "group": group}
+                  "group": group, "rdcc_nbytes": cls.BULK_RDCC_NBYTES,
+                  "rdcc_nslots": cls.BULK_RDCC_NSLOTS}
         with cls(h5_file, **kwargs) as f:
             # Save time index
             f['time_index'] = time_index
@@ -759,7 +936,8 @@ class Outputs(Resource):
 
             # Write dset to disk
             f._add_dset(dset_name, profiles, dtype,
-                        chunks=chunks, attrs=attrs)
+                        chunks=chunks, attrs=attrs, compression=compression,
+                        compression_opts=compression_opts, shuffle=shuffle)
             logger.debug("\t- '{}' saved to disc".format(dset_name))
 
         tt = (time.time() - ts) / 60
@@ -770,7 +948,8 @@ class Outputs(Resource):
     @classmethod
     def write_means(cls, h5_file, meta, dset_name, means, attrs, dtype,
                     SAM_configs=None, chunks=None, unscale=True, mode='w-',
-                    str_decode=True, group=None):
+                    str_decode=True, group=None, compression='gzip',
+                    compression_opts=None, shuffle=True):
         """
         Write means array to disk
 
@@ -801,6 +980,13 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        compression : str | None
+            h5py compression filter for the means dataset, None for no
+            compression
+        compression_opts : int | None
+            Compression filter settings, e.g. gzip level
+        shuffle : bool
+            Flag to apply the byte shuffle filter before compression
         """
         logger.info("Saving means ({}) to {}".format(dset_name, h5_file))
         if len(means) != len(meta):
@@ -822,7 +1008,8 @@ class Outputs(Resource):
 
             # Write dset to disk
             f._add_dset(dset_name, means, dtype,
-                        chunks=chunks, attrs=attrs)
+                        chunks=chunks, attrs=attrs, compression=compression,
+                        compression_opts=compression_opts, shuffle=shuffle)
             logger.debug("\t- '{}' saved to disc".format(dset_name))
 
         tt = (time.time() - ts) / 60
@@ -47,7 +47,7 @@ class Offshore:
         gen_fpath : str
             Full filepath to reV gen h5 output file.
         offshore_fpath : str
-            Full filepath to offshore wind farm data file.
+            Full filepath to offshore wind farm data file (.csv or .parquet).
         project_points : reV.config.project_points.ProjectPoints
             Instantiated project points instance.
         max_workers : int | None
@@ -94,6 +94,7 @@ class Offshore:
             self._parse_offshore_fpath(self._offshore_fpath)
 
         self._d, self._i, self._d_lim = self._run_nn()
+        self._farm_ilocs = self._get_farm_ilocs(self._i)
 
         self._out = self._init_offshore_out_arrays()
 
@@ -173,7 +174,7 @@ class Offshore:
         Parameters
         ----------
         offshore_fpath : str
-            Full filepath to offshore wind farm data file.
+            Full filepath to offshore wind farm data file (.csv or .parquet).
 
         Returns
         -------
@@ -184,7 +185,11 @@ class Offshore:
             Latitude/longitude coordinates for each offshore farm.
         """
 
-        offshore_data = pd.read_csv(offshore_fpath)
+        if str(offshore_fpath).endswith('.parquet'):
+            # columnar binary format, no text parsing required
+            offshore_data = pd.read_parquet(offshore_fpath)
+        else:
+            offshore_data = pd.read_csv(offshore_fpath)
         lat_label, lon_label = get_lat_lon_cols(offshore_data)
 
         if len(lat_label) > 1 or len(lon_label) > 1:
@@ -234,6 +239,29 @@ class Offshore:
 
         return d, i, d_lim
 
+    @staticmethod
+    def _get_farm_ilocs(i):
+        """Group the offshore resource pixels by their nearest wind farm.
+
+        Parameters
+        ----------
+        i : np.ndarray
+            Offshore farm row numbers corresponding to resource pixels
+            (length is number of offshore resource pixels in gen_fpath).
+
+        Returns
+        -------
+        farm_ilocs : dict
+            Lookup of farm row number (-1 for pixels not close to a farm)
+            to the sorted offshore resource pixel locations (ilocs in
+            meta_source_offshore) that map to that farm.
+        """
+        order = np.argsort(i, kind='stable')
+        farms, splits = np.unique(i[order], return_index=True)
+        farm_ilocs = dict(zip(farms.tolist(), np.split(order, splits[1:])))
+
+        return farm_ilocs
+
     @property
     def time_index(self):
         """Get the source time index."""
@@ -306,7 +334,7 @@ class Offshore:
                 misc = {k: None for k in new_misc.keys()}
 
                 if res_gid is not None:
-                    ilocs = np.where(self._i == i)[0]
+                    ilocs = self._farm_ilocs[i]
 
                     if len(ilocs) > self._small_farm_limit:
                         meta_sub = self.meta_source_offshore.iloc[ilocs]
@@ -633,8 +661,8 @@ class Offshore:
         res_gid = None
         farm_gid = None
 
-        if ifarm in self._i:
-            inds = np.where(self._i == ifarm)[0]
+        if ifarm in self._farm_ilocs:
+            inds = self._farm_ilocs[ifarm]
             dists = self._d[inds]
             ind_min = inds[np.argmin(dists)]
             res_site = self.meta_source_offshore.iloc[ind_min]
@@ -726,7 +754,7 @@ class Offshore:
             self._check_dist(meta, row)
 
             if farm_gid is not None:
-                cf_ilocs = np.where(self._i == ifarm)[0]
+                cf_ilocs = self._farm_ilocs[ifarm]
                 meta = self.meta_source_offshore.iloc[cf_ilocs]
                 system_inputs = self._get_system_inputs(res_gid)
                 site_data = row.to_dict()
@@ -764,7 +792,7 @@ class Offshore:
                 self._check_dist(meta, row)
 
                 if farm_gid is not None:
-                    cf_ilocs = np.where(self._i == ifarm)[0]
+                    cf_ilocs = self._farm_ilocs[ifarm]
                     meta = self.meta_source_offshore.iloc[cf_ilocs]
                     system_inputs = self._get_system_inputs(res_gid)
                     site_data = row.to_dict()
@@ -806,7 +834,7 @@ class Offshore:
         gen_fpath : str
             Full filepath to reV gen h5 output file.
         offshore_fpath : str
-            Full filepath to offshore wind farm data file.
+            Full filepath to offshore wind farm data file (.csv or .parquet).
         points : slice | list | str | reV.config.project_points.PointsControl
             Slice specifying project points, or string pointing to a project
             points csv, or a fully instantiated PointsControl object.
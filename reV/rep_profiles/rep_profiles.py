@@ -790,24 +790,16 @@ class RepProfilesBase(ABC):
                 out._create_dset('rev_summary', rev_sum.shape,
                                  rev_sum.dtype, data=rev_sum)
 
-    def _write_h5_out(self, fout, save_rev_summary=True):
-        """Write profiles and meta to an output file.
+    def _write_h5_out(self, fout):
+        """Write profiles to an output file initialized by _init_h5_out, which
+        also writes the meta and the rev_summary table (if requested).
 
         Parameters
         ----------
         fout : str
             None or filepath to output h5 file.
-        save_rev_summary : bool
-            Flag to save full reV SC table to rep profile output.
-        scaled_precision : bool
-            Flag to scale cf_profiles by 1000 and save as uint16.
         """
         with Outputs(fout, mode='a') as out:
-
-            if 'rev_summary' in out.datasets and save_rev_summary:
-                rev_sum = to_records_array(self._rev_summary)
-                out['rev_summary'] = rev_sum
-
             for i in range(self._n_profiles):
                 dset = 'rep_profiles_{}'.format(i)
                 out[dset] = self.profiles[i]
@@ -828,7 +820,7 @@ class RepProfilesBase(ABC):
 
         self._init_h5_out(fout, save_rev_summary=save_rev_summary,
                           scaled_precision=scaled_precision)
-        self._write_h5_out(fout, save_rev_summary=save_rev_summary)
+        self._write_h5_out(fout)
 
     @abstractmethod
     def _run_serial(self):
@@ -11,9 +11,42 @@ from rex.utilities.loggers import log_mem
 from reV.handlers.exclusions import ExclusionLayers
 from reV.utilities.exceptions import ExclusionLayerError
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
 
+def _exclude_labels(mask, labels, bad_labels):
+    """
+    Set mask to zero in place wherever labels is flagged in bad_labels
+
+    Parameters
+    ----------
+    mask : ndarray
+        2D inclusion mask, updated in place
+    labels : ndarray
+        2D array of contiguous area labels, same shape as mask
+    bad_labels : ndarray
+        Boolean lookup of labels to exclude, indexed by label
+    """
+    mask[bad_labels[labels]] = 0
+
+
+if numba is not None:
+    # no prange: masks are built per supply curve point inside aggregation
+    # process pool workers, which already use all cores
+    @numba.njit(cache=True)
+    def _exclude_labels(mask, labels, bad_labels):  # noqa: F811
+        """Numba compiled version of _exclude_labels"""
+        for i in range(mask.shape[0]):
+            for j in range(mask.shape[1]):
+                if bad_labels[labels[i, j]]:
+                    mask[i, j] = 0
+
+
 class LayerMask:
     """
     Class to convert exclusion layer to inclusion layer mask
@@ -180,6 +213,19 @@ class LayerMask:
         """
         return self._mask_type
 
+    @property
+    def is_boolean(self):
+        """
+        Flag for whether the layer mask is purely included/excluded, i.e. an
+        unweighted range, exclude, or include mask
+
+        Returns
+        -------
+        bool
+        """
+        return (not self._as_weights and self._weight == 1
+                and self.mask_type in ('range', 'exclude', 'include'))
+
     def _apply_mask(self, data):
         """
         Apply mask function
@@ -195,7 +241,30 @@ class LayerMask:
             Masked exclusion data with weights applied such that 1 is included,
             0 is excluded, 0.5 is half included.
         """
+        data = self._raw_mask(data)
+        data = data.astype('float32')
+        if self._weight != 1:
+            data *= np.float32(self._weight)
+
+        return data
 
+    def _raw_mask(self, data):
+        """
+        Apply mask function without casting to float or applying the layer
+        weight
+
+        Parameters
+        ----------
+        data : ndarray
+            Exclusions data to create mask from
+
+        Returns
+        -------
+        data : ndarray
+            Boolean mask for range, exclude, and include masks, otherwise
+            unweighted inclusion weights or the input data if the layer is
+            used as weights.
+        """
         if not self._as_weights:
             if self.mask_type == 'range':
                 func = self._range_mask
@@ -214,8 +283,6 @@ class LayerMask:
 
             data = func(data)
 
-        data = data.astype('float32') * self._weight
-
         return data
 
     def _check_mask_type(self):
@@ -270,15 +337,23 @@ class LayerMask:
         mask : ndarray
             Boolean mask of which values to include (True is include).
         """
-        mask = True
+        # fill a single boolean mask in place, re-using one scratch buffer
+        # for any additional comparisons
+        mask = None
+        buf = None
         if self.min_value is not None:
-            mask = data >= self.min_value
+            mask = np.greater_equal(data, self.min_value)
 
         if self.max_value is not None:
-            mask *= data <= self.max_value
+            if mask is None:
+                mask = np.less_equal(data, self.max_value)
+            else:
+                buf = np.less_equal(data, self.max_value)
+                mask &= buf
 
         if self._exclude_nodata and self.nodata_value is not None:
-            mask = mask & (data != self.nodata_value)
+            buf = np.not_equal(data, self.nodata_value, out=buf)
+            mask &= buf
 
         return mask
 
@@ -302,17 +377,57 @@ class LayerMask:
         mask : ndarray
             Boolean mask of which values to include (True is include)
         """
-        mask = np.isin(data, values)
+        mask = self._lookup_values(data, values)
+        if mask is None:
+            mask = np.isin(data, values)
 
         if not include:
-            mask = ~mask
+            np.logical_not(mask, out=mask)
 
         # only include if not nodata
         if self._exclude_nodata and self.nodata_value is not None:
-            mask = mask & (data != self.nodata_value)
+            mask &= data != self.nodata_value
 
         return mask
 
+    @staticmethod
+    def _lookup_values(data, values):
+        """
+        Mask small integer exclusion layers (itemsize <= 2) using a lookup
+        table with one entry per possible value, replacing np.isin with a
+        single gather pass over data
+
+        Parameters
+        ----------
+        data : ndarray
+            Exclusions data to create mask from
+        values : list
+            Values to find in data
+
+        Returns
+        -------
+        mask : ndarray | NoneType
+            Boolean mask, True where data is in values, None if data or
+            values are not suited to a lookup table
+        """
+        dtype = data.dtype
+        values = np.asarray(values)
+        if (dtype.kind not in 'iu' or dtype.itemsize > 2
+                or values.dtype.kind not in 'biuf'):
+            return None
+
+        # only values that can be represented by the data dtype can match
+        info = np.iinfo(dtype)
+        values = values[(values >= info.min) & (values <= info.max)
+                        & (values == np.floor(values))]
+
+        # index with the unsigned view so negative values map into the table
+        view = np.dtype('u{}'.format(dtype.itemsize))
+        lut = np.zeros(2 ** (8 * dtype.itemsize), dtype=bool)
+        lut[values.astype(dtype).view(view)] = True
+
+        return lut[data.view(view)]
+
     def _exclusion_mask(self, data):
         """
         Mask exclusion layer based on values to exclude
@@ -383,13 +498,14 @@ class ExclusionMask:
     Class to create final exclusion mask
     """
 
+    # boolean structures so ndimage.label can use them without conversion
     FILTER_KERNELS = {
         'queen': np.array([[1, 1, 1],
                            [1, 1, 1],
-                           [1, 1, 1]]),
+                           [1, 1, 1]], dtype=bool),
         'rook': np.array([[0, 1, 0],
                           [1, 1, 1],
-                          [0, 1, 0]])}
+                          [0, 1, 0]], dtype=bool)}
 
     def __init__(self, excl_h5, layers=None, min_area=None,
                  kernel='queen', hsds=False, check_layers=False):
@@ -414,6 +530,7 @@ class ExclusionMask:
         self._layers = {}
         self._excl_h5 = ExclusionLayers(excl_h5, hsds=hsds)
         self._excl_layers = None
+        self._excl_layer_set = None
         self._check_layers = check_layers
 
         if layers is not None:
@@ -513,6 +630,20 @@ class ExclusionMask:
 
         return self._excl_layers
 
+    @property
+    def _excl_layers_lookup(self):
+        """
+        Set of available exclusion layers for O(1) membership checks
+
+        Returns
+        -------
+        _excl_layer_set : set
+        """
+        if self._excl_layer_set is None:
+            self._excl_layer_set = set(self.excl_layers)
+
+        return self._excl_layer_set
+
     @property
     def layer_names(self):
         """
@@ -580,12 +711,12 @@ class ExclusionMask:
         """
         layer_name = layer.layer
 
-        if layer_name not in self.excl_layers:
+        if layer_name not in self._excl_layers_lookup:
             msg = "{} does not existin in {}".format(layer_name, self._excl_h5)
             logger.error(msg)
             raise KeyError(layer_name)
 
-        if layer_name in self.layer_names:
+        if layer_name in self._layers:
             msg = "{} is already in {}".format(layer_name, self)
             if replace:
                 msg += " replacing existing layer"
@@ -621,6 +752,25 @@ class ExclusionMask:
 
         return nodata
 
+    @staticmethod
+    def _get_min_counts(min_area, excl_area=0.0081):
+        """
+        Get the minimum number of contiguous pixels needed to meet min_area
+
+        Parameters
+        ----------
+        min_area : float
+            Minimum required contiguous area in sq-km
+        excl_area : float
+            Area of each exclusion pixel in km^2, assumes 90m resolution
+
+        Returns
+        -------
+        int
+            Minimum number of contiguous pixels
+        """
+        return int(np.ceil(min_area / excl_area))
+
     @classmethod
     def _area_filter(cls, mask, min_area=1, kernel='queen', excl_area=0.0081):
         """
@@ -644,18 +794,19 @@ class ExclusionMask:
             Updated inclusion mask
         """
         s = cls.FILTER_KERNELS[kernel]
-        labels, _ = ndimage.label(mask > 0, structure=s)
-        l, c = np.unique(labels, return_counts=True)
+        labels, n_labels = ndimage.label(mask > 0, structure=s,
+                                         output=np.int32)
+        counts = np.bincount(labels.ravel(), minlength=n_labels + 1)
 
-        min_counts = np.ceil(min_area / excl_area)
-        pos = c[1:] < min_counts
-        bad_labels = l[1:][pos]
+        min_counts = cls._get_min_counts(min_area, excl_area=excl_area)
+        bad_labels = counts < min_counts
+        bad_labels[0] = False
 
-        mask[np.isin(labels, bad_labels)] = 0
+        _exclude_labels(mask, labels, bad_labels)
 
         return mask
 
-    def _increase_mask_slice(self, ds_slice, n=1):
+    def _increase_mask_slice(self, ds_slice, n=1, max_pad=None):
         """Increase the mask slice, e.g. from 64x64 to 192x192, to help the
         contiguous area filter be more accurate.
 
@@ -668,6 +819,9 @@ class ExclusionMask:
             Number of blocks to increase in each direction. For example,
             a 64x64 slice with n=1 will increase to 192x192
             (increases by 64xn in each direction).
+        max_pad : int | None
+            Maximum number of pixels to increase in each direction. None
+            will increase by the full n blocks.
 
         Returns
         -------
@@ -684,8 +838,13 @@ class ExclusionMask:
             y_slice = ds_slice[0]
             x_slice = ds_slice[1]
             if isinstance(x_slice, slice) and isinstance(y_slice, slice):
-                y_diff = n * np.abs(y_slice.stop - y_slice.start)
-                x_diff = n * np.abs(x_slice.stop - x_slice.start)
+                y_len = np.abs(y_slice.stop - y_slice.start)
+                x_len = np.abs(x_slice.stop - x_slice.start)
+                y_diff = n * y_len
+                x_diff = n * x_len
+                if max_pad is not None:
+                    y_diff = np.min((y_diff, max_pad))
+                    x_diff = np.min((x_diff, max_pad))
 
                 y_new_start = int(np.max((0, (y_slice.start - y_diff))))
                 x_new_start = int(np.max((0, (x_slice.start - x_diff))))
@@ -698,17 +857,10 @@ class ExclusionMask:
                 new_slice = (slice(y_new_start, y_new_stop),
                              slice(x_new_start, x_new_stop))
 
-                if y_new_start == y_slice.start:
-                    y_sub_start = 0
-                else:
-                    y_sub_start = int(n * y_diff)
-                if x_new_start == x_slice.start:
-                    x_sub_start = 0
-                else:
-                    x_sub_start = int(n * x_diff)
-
-                y_sub_stop = y_sub_start + y_diff
-                x_sub_stop = x_sub_start + x_diff
+                y_sub_start = int(y_slice.start - y_new_start)
+                x_sub_start = int(x_slice.start - x_new_start)
+                y_sub_stop = y_sub_start + y_len
+                x_sub_stop = x_sub_start + x_len
 
                 sub_slice = (slice(y_sub_start, y_sub_stop),
                              slice(x_sub_start, x_sub_stop))
@@ -754,7 +906,67 @@ class ExclusionMask:
             if mask is None:
                 mask = layer_mask
             else:
-                mask = np.maximum(mask, layer_mask, dtype='float32')
+                np.maximum(mask, layer_mask, out=mask)
+
+        return mask
+
+    def _combine_layers(self, layers, ds_slice):
+        """
+        Combine exclusion layers, unweighted include/exclude layers are
+        combined first as boolean masks and only cast to float32 once.
+        Once they exclude every pixel, the remaining include/exclude layers
+        are not read.
+
+        Parameters
+        ----------
+        layers : list
+            List of (non force inclusion) layers to combine
+        ds_slice : int | slice | list | ndarray
+            What to extract from ds, each arg is for a sequential axis.
+            For example, (slice(0, 64), slice(0, 64)) will extract a 64x64
+            exclusions mask.
+
+        Returns
+        -------
+        mask : ndarray
+            Multiplicative inclusion mask with all layers multiplied together
+            ("and" operation) such that 1 is included, 0 is excluded,
+            0.5 is half.
+        """
+        mask = None
+        bool_mask = None
+        excluded = False
+        for layer in sorted(layers, key=lambda x: not x.is_boolean):
+            if excluded and layer.mask_type is not None:
+                # the mask is all zeros and this layer can only be >= 0, skip
+                # it, layers used as weights can still lower the mask
+                logger.debug('All pixels excluded, skipping {}'
+                             .format(layer))
+                continue
+
+            logger.debug('Computing exclusions {}'.format(layer))
+            log_mem(logger, log_level='DEBUG')
+            layer_slice = (layer.layer, ) + ds_slice
+            if layer.is_boolean:
+                layer_mask = layer._raw_mask(self.excl_h5[layer_slice])
+                if bool_mask is None:
+                    bool_mask = layer_mask
+                else:
+                    bool_mask &= layer_mask
+
+                excluded = not bool_mask.any()
+            else:
+                layer_mask = layer[self.excl_h5[layer_slice]]
+                if mask is None:
+                    mask = layer_mask
+                else:
+                    np.minimum(mask, layer_mask, out=mask)
+
+        if bool_mask is not None:
+            if mask is None:
+                mask = bool_mask.astype('float32')
+            else:
+                np.minimum(mask, bool_mask, out=mask)
 
         return mask
 
@@ -777,26 +989,24 @@ class ExclusionMask:
             0.5 is half.
         """
         mask = None
-        if len(ds_slice) == 1 & isinstance(ds_slice[0], tuple):
+        if len(ds_slice) == 1 and isinstance(ds_slice[0], tuple):
             ds_slice = ds_slice[0]
 
         if self._min_area is not None:
-            ds_slice, sub_slice = self._increase_mask_slice(ds_slice, n=1)
+            # a contiguous area of at least min_counts pixels always reaches
+            # that size within min_counts - 1 pixels of any of its pixels, so
+            # a larger halo does not change the area filter result
+            min_counts = self._get_min_counts(self._min_area)
+            ds_slice, sub_slice = self._increase_mask_slice(
+                ds_slice, n=1, max_pad=max(0, min_counts - 1))
 
         if self.layers:
-            force_include = []
-            for layer in self.layers:
-                if layer.force_include:
-                    force_include.append(layer)
-                else:
-                    logger.debug('Computing exclusions {}'.format(layer))
-                    log_mem(logger, log_level='DEBUG')
-                    layer_slice = (layer.layer, ) + ds_slice
-                    layer_mask = layer[self.excl_h5[layer_slice]]
-                    if mask is None:
-                        mask = layer_mask
-                    else:
-                        mask = np.minimum(mask, layer_mask, dtype='float32')
+            force_include = [layer for layer in self.layers
+                             if layer.force_include]
+            layers = [layer for layer in self.layers
+                      if not layer.force_include]
+            if layers:
+                mask = self._combine_layers(layers, ds_slice)
 
             if force_include:
                 logger.debug('Computing forced inclusions')
@@ -954,7 +1164,7 @@ class FrictionMask(ExclusionMask):
         """
 
         mask = None
-        if len(ds_slice) == 1 & isinstance(ds_slice[0], tuple):
+        if len(ds_slice) == 1 and isinstance(ds_slice[0], tuple):
             ds_slice = ds_slice[0]
 
         layer_slice = (self._layers[self._fric_dset].layer, ) + ds_slice
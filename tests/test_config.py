@@ -7,17 +7,23 @@ Created on Thu Nov 29 09:54:51 2018
 
 @author: gbuster
 """
+import json
 import numpy as np
 import os
 import pandas as pd
+import pickle
 import pytest
+import tempfile
+import threading
 
 from rex import Resource
 from rex.utilities.exceptions import ResourceRuntimeError
 
 from reV.config.base_analysis_config import AnalysisConfig
+from reV.config.base_config import BaseConfig
 from reV.config.rep_profiles_config import RepProfilesConfig
 from reV.config.project_points import ProjectPoints, PointsControl
+from reV.handlers.outputs import Outputs
 from reV.generation.generation import Gen
 from reV.SAM.SAM import RevPySam
 from reV import TESTDATADIR
@@ -42,6 +48,48 @@ def test_overwrite():
         RepProfilesConfig(config_path)
 
 
+def test_str_replace():
+    """Test that every replacement is applied to each string value in turn
+    and that nested dicts and lists are traversed."""
+    strrep = {'REVDIR': '/rev', './': '/config/'}
+    config = {'a': 'REVDIR/data.h5',
+              'b': './REVDIR/out.h5',
+              'c': {'d': ['./f0.h5', {'e': './f1.h5'}], 'g': 1}}
+    out = BaseConfig.str_replace(config, strrep)
+
+    assert out['a'] == '/rev/data.h5'
+    assert out['b'] == '/config//rev/out.h5'
+    assert out['c']['d'][0] == '/config/f0.h5'
+    assert out['c']['d'][1]['e'] == '/config/f1.h5'
+    assert out['c']['g'] == 1
+
+    shared = {'fp': './shared.h5'}
+    config = {'a': shared, 'b': [shared, shared]}
+    out = BaseConfig.str_replace(config, strrep)
+    assert out['a']['fp'] == '/config/shared.h5'
+    assert out['b'][1] is out['a']
+
+
+def test_get_file_cache():
+    """Test that cached config files are returned as independent copies and
+    that edits to the file on disk are picked up."""
+    with tempfile.TemporaryDirectory() as td:
+        fp = os.path.join(td, 'config.json')
+        with open(fp, 'w') as f:
+            json.dump({'a': {'b': './out.h5'}}, f)
+
+        config0 = BaseConfig.get_file(fp)
+        config0['a']['b'] = 'modified'
+        config1 = BaseConfig.get_file(fp)
+        assert config1['a']['b'] == './out.h5'
+
+        with open(fp, 'w') as f:
+            json.dump({'a': {'b': './new_out.h5'}}, f)
+
+        config2 = BaseConfig.get_file(fp)
+        assert config2['a']['b'] == './new_out.h5'
+
+
 def test_clearsky():
     """
     Test Clearsky
@@ -124,6 +172,99 @@ def test_split_iter():
             assert split.equals(target), msg
 
 
+def get_wind_points_control(n=3):
+    """Get a PointsControl instance for 20 wind sites
+
+    Parameters
+    ----------
+    n : int
+        Sites per split
+
+    Returns
+    -------
+    pc : PointsControl
+        PointsControl instance with 20 sites
+    """
+    res_file = os.path.join(TESTDATADIR, 'wtk/ri_100_wtk_2012.h5')
+    sam_files = os.path.join(TESTDATADIR,
+                             'SAM/wind_gen_standard_losses_0.json')
+    pp = ProjectPoints(slice(0, 100, 5), sam_files, 'windpower',
+                       res_file=res_file)
+
+    return PointsControl(pp, sites_per_split=n)
+
+
+def test_open_slice_rewritten_res_file():
+    """Test that open-ended slice project points see the new number of sites
+    after a resource file is rewritten at the same path."""
+    sam_files = os.path.join(TESTDATADIR,
+                             'SAM/wind_gen_standard_losses_0.json')
+    time_index = pd.date_range('20120101', periods=24, freq='1h')
+    with tempfile.TemporaryDirectory() as td:
+        res_file = os.path.join(td, 'res.h5')
+        for n in (10, 20):
+            meta = pd.DataFrame({'latitude': np.arange(n, dtype=float),
+                                 'longitude': np.zeros(n)})
+            with Outputs(res_file, mode='w') as f:
+                f.meta = meta
+                f.time_index = time_index
+
+            pp = ProjectPoints(slice(0, None), sam_files, 'windpower',
+                               res_file=res_file)
+            assert len(pp) == n
+
+
+def test_proj_control_reiter():
+    """Test that PointsControl can be iterated more than once and that the
+    prefetch thread is stopped after each full pass"""
+    pc = get_wind_points_control()
+    first = [pc_split.split_range for pc_split in pc]
+    assert pc._executor is None
+    assert pc._prefetch is None
+
+    second = [pc_split.split_range for pc_split in pc]
+    assert first == second
+    assert len(first) == len(pc)
+    assert first[0] == [0, 3]
+    assert first[-1] == [18, 20]
+
+
+def test_proj_control_break():
+    """Test that breaking out of a PointsControl iteration shuts down the
+    prefetch thread and pending split"""
+    pc = get_wind_points_control()
+    n_threads = threading.active_count()
+    for i, pc_split in enumerate(pc):
+        assert pc._executor is not None
+        if i == 1:
+            break
+
+    assert pc._executor is None
+    assert pc._prefetch is None
+    assert threading.active_count() == n_threads
+
+
+def test_proj_control_pickle():
+    """Test pickling a PointsControl instance in the middle of an iteration
+    with a pending prefetched split"""
+    pc = get_wind_points_control()
+    splits = iter(pc)
+    assert next(splits).split_range == [0, 3]
+    assert pc._prefetch is not None
+
+    pc_copy = pickle.loads(pickle.dumps(pc))
+    assert pc_copy._executor is None
+    assert pc_copy._prefetch is None
+    assert next(pc_copy).split_range == [3, 6]
+    assert next(splits).split_range == [3, 6]
+    splits.close()
+    assert pc._executor is None
+
+    truth = [pc_split.split_range for pc_split in pc]
+    assert [pc_split.split_range for pc_split in pc_copy] == truth
+    assert pc_copy._executor is None
+
+
 def test_config_mapping():
     """Test the mapping of multiple configs in the project points."""
     fpp = os.path.join(TESTDATADIR, 'project_points/pp_offshore.csv')
@@ -5,6 +5,7 @@ pytests for MultiYear collection and computation
 import h5py
 import numpy as np
 import os
+import pandas as pd
 import shutil
 import pytest
 import tempfile
@@ -292,6 +293,154 @@ def test_my_stdev(dset, group):
         compare_arrays(my_std, dset_std, "Saved STDEV")
 
 
+def write_filtered_sources(temp, **filters):
+    """
+    Write synthetic annual source files with a cf_profile dataset that uses
+    the given h5py filter kwargs
+
+    Parameters
+    ----------
+    temp : str
+        Directory to write source files to
+    filters : dict
+        h5py create_dataset filter kwargs, e.g. compression='lzf'
+
+    Returns
+    -------
+    source_files : list
+        Annual source .h5 files
+    """
+    meta = pd.DataFrame({'latitude': np.arange(200, dtype=float),
+                         'longitude': np.zeros(200)})
+    source_files = []
+    for year in YEARS:
+        fp = os.path.join(temp, 'gen_{}.h5'.format(year))
+        with Outputs(fp, mode='w') as f:
+            f.meta = meta
+            f.time_index = pd.date_range(str(year), periods=48, freq='1h')
+
+        data = np.random.uniform(0, 1, (48, 200)).astype(np.float32)
+        with h5py.File(fp, mode='a') as f:
+            f.create_dataset('cf_profile', data=data, chunks=(48, 50),
+                             **filters)
+
+        source_files.append(fp)
+
+    return source_files
+
+
+@pytest.mark.parametrize('filters', [
+    {'compression': 'lzf'},
+    {'compression': 'lzf', 'shuffle': True, 'fletcher32': True},
+    {'scaleoffset': 3},
+    {'compression': 'gzip', 'compression_opts': 9, 'shuffle': True}])
+def test_collect_filters(filters):
+    """Test collection of datasets written with non-default filters"""
+    with tempfile.TemporaryDirectory() as temp:
+        source_files = write_filtered_sources(temp, **filters)
+        my_out = os.path.join(temp, 'MY.h5')
+        with MultiYear(my_out, mode='w') as my:
+            my.collect(source_files, 'cf_profile')
+
+        for year, fp in zip(YEARS, source_files):
+            dset_out = 'cf_profile-{}'.format(year)
+            with h5py.File(fp, mode='r') as f_in:
+                with h5py.File(my_out, mode='r') as f_out:
+                    ds_in = f_in['cf_profile']
+                    ds_out = f_out[dset_out]
+                    assert MultiYear._same_layout(ds_in, ds_out)
+                    assert np.array_equal(ds_in[...], ds_out[...])
+
+
+def test_collect_plugin_filter():
+    """Test collection of a dataset written with an hdf5 plugin filter, which
+    h5py reports as compression=None"""
+    hdf5plugin = pytest.importorskip('hdf5plugin')
+    with tempfile.TemporaryDirectory() as temp:
+        source_files = write_filtered_sources(temp, **hdf5plugin.Blosc())
+        my_out = os.path.join(temp, 'MY.h5')
+        with MultiYear(my_out, mode='w') as my:
+            my.collect(source_files, 'cf_profile')
+
+        for year, fp in zip(YEARS, source_files):
+            dset_out = 'cf_profile-{}'.format(year)
+            with h5py.File(fp, mode='r') as f_in:
+                with h5py.File(my_out, mode='r') as f_out:
+                    ds_in = f_in['cf_profile']
+                    ds_out = f_out[dset_out]
+                    assert not MultiYear._builtin_filters(ds_in)
+                    assert not MultiYear._same_layout(ds_in, ds_out)
+                    assert np.array_equal(ds_in[...], ds_out[...])
+
+
+def write_annual_means(my_out, dtype, attrs):
+    """
+    Write synthetic annual cf_mean datasets directly into a multi-year file
+
+    Parameters
+    ----------
+    my_out : str
+        Path to multi-year .h5 file to create
+    dtype : np.dtype
+        Dataset dtype on disk
+    attrs : dict
+        Dataset attributes, e.g. scale_factor and add_offset
+    """
+    n = 1000
+    meta = pd.DataFrame({'latitude': np.arange(n, dtype=float),
+                         'longitude': np.zeros(n)})
+    with MultiYear(my_out, mode='w') as my:
+        my.meta = meta
+
+    with h5py.File(my_out, mode='a') as f:
+        for year in YEARS:
+            data = np.random.uniform(0, 30, n).astype(dtype)
+            ds = f.create_dataset('cf_mean-{}'.format(year), data=data,
+                                  chunks=(100,))
+            ds.attrs.update(attrs)
+
+
+@pytest.mark.parametrize(('dtype', 'attrs'), [
+    (np.int16, {'scale_factor': 1000}),
+    (np.int16, {'scale_factor': 0.001, 'add_offset': 5}),
+    (np.float32, {}),
+    (np.float64, {})])
+def test_iter_chunks_unscale(dtype, attrs):
+    """Test that block-wise reads unscale like rex, including add_offset,
+    and keep float64 source precision"""
+    with tempfile.TemporaryDirectory() as temp:
+        my_out = os.path.join(temp, 'MY.h5')
+        write_annual_means(my_out, dtype, attrs)
+        with MultiYear(my_out, mode='r') as my:
+            for year in YEARS:
+                dset = 'cf_mean-{}'.format(year)
+                truth = my[dset]
+                blocks = np.concatenate([data.copy() for _, data
+                                         in my._iter_chunks(dset)])
+                if np.issubdtype(dtype, np.floating):
+                    assert blocks.dtype == dtype
+                    assert np.array_equal(blocks, truth)
+                else:
+                    assert np.allclose(blocks, truth, rtol=1e-6)
+
+
+@pytest.mark.parametrize('attrs', [
+    {'scale_factor': 1000},
+    {'scale_factor': 0.001, 'add_offset': 5}])
+def test_unscaled_means_stdev(attrs):
+    """Test multi-year means and stdev of scaled integer datasets"""
+    with tempfile.TemporaryDirectory() as temp:
+        my_out = os.path.join(temp, 'MY.h5')
+        write_annual_means(my_out, np.int16, attrs)
+        with MultiYear(my_out, mode='a') as my:
+            arr = np.array([my['cf_mean-{}'.format(year)] for year in YEARS])
+            means, stdev = my._compute_means_stdev('cf_mean-means',
+                                                   'cf_mean-stdev')
+
+        assert np.allclose(means, arr.mean(axis=0), rtol=1e-5, atol=1e-5)
+        assert np.allclose(stdev, arr.std(axis=0), rtol=1e-4, atol=1e-4)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
@@ -101,6 +101,70 @@ def test_add_dset():
             assert np.allclose(f['dset3'][...], arr3 * 100)
 
 
+def test_write_profiles():
+    """Test compressed, slab-by-slab writing of scaled profiles"""
+
+    with tempfile.TemporaryDirectory() as td:
+        fp = os.path.join(td, 'outputs.h5')
+
+        Outputs.write_profiles(fp, meta, time_index, 'dset3', arr3,
+                               {'scale_factor': 100}, np.int32,
+                               chunks=(None, 10))
+        Outputs.add_dataset(fp, 'dset4', arr3, {'scale_factor': 100},
+                            np.int32)
+
+        with h5py.File(fp, 'r') as f:
+            assert f['dset3'].compression == 'gzip'
+            assert f['dset3'].shuffle
+            assert f['dset3'].chunks == (8760, 10)
+            assert np.allclose(f['dset3'][...], arr3 * 100)
+            assert f['dset4'].compression is None
+            assert f['dset4'].chunks[0] == 8760
+            assert np.allclose(f['dset4'][...], arr3 * 100)
+
+        with Outputs(fp) as f:
+            assert np.allclose(f['dset3'], arr3)
+
+
+def test_datasets_cache():
+    """Test that mutating the datasets list does not change the handler's
+    cached dataset listing"""
+
+    with tempfile.TemporaryDirectory() as td:
+        fp = os.path.join(td, 'outputs.h5')
+
+        with Outputs(fp, 'w') as f:
+            f.meta = meta
+            f.time_index = time_index
+            dsets = f.datasets
+            dsets.remove('meta')
+            dsets.append('dset1')
+            assert 'meta' in f.datasets
+            assert 'dset1' not in f.datasets
+
+            f._create_dset('dset1', arr1.shape, arr1.dtype, data=arr1)
+            assert 'dset1' in f.datasets
+            assert sorted(f.datasets) == ['dset1', 'meta', 'time_index']
+
+
+def test_chunk_cache():
+    """Test that the large chunk cache is only used when requested"""
+
+    with tempfile.TemporaryDirectory() as td:
+        fp = os.path.join(td, 'outputs.h5')
+
+        with Outputs(fp, 'w') as f:
+            f.meta = meta
+            cache = f.h5.id.get_access_plist().get_cache()
+            assert cache[2] < Outputs.BULK_RDCC_NBYTES
+
+        with Outputs(fp, 'a', rdcc_nbytes=Outputs.BULK_RDCC_NBYTES,
+                     rdcc_nslots=Outputs.BULK_RDCC_NSLOTS) as f:
+            cache = f.h5.id.get_access_plist().get_cache()
+            assert cache[1] == Outputs.BULK_RDCC_NSLOTS
+            assert cache[2] == Outputs.BULK_RDCC_NBYTES
+
+
 def test_bad_shape():
     """Negative test for bad data shapes"""
 
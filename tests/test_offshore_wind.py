@@ -9,6 +9,7 @@ Created on Dec 16 2019
 
 import os
 import pytest
+import tempfile
 import numpy as np
 import pandas as pd
 import json
@@ -66,6 +67,31 @@ RTOL = 0.001
 PURGE_OUT = True
 
 
+def get_gid_locs(meta_gids, gids):
+    """Get the row locations of gids in an (unsorted) array of meta gids
+
+    Parameters
+    ----------
+    meta_gids : np.ndarray
+        Array of unique gids, e.g. the meta data "gid" column.
+    gids : list | np.ndarray
+        Gids to find in meta_gids.
+
+    Returns
+    -------
+    locs : np.ndarray
+        Row locations in meta_gids for each entry in gids.
+    """
+    meta_gids = np.ascontiguousarray(meta_gids, dtype=np.int64)
+    gids = np.ascontiguousarray(gids, dtype=np.int64)
+    order = np.argsort(meta_gids)
+    locs = order[np.searchsorted(meta_gids, gids, sorter=order)
+                 % len(meta_gids)]
+    assert np.array_equal(meta_gids[locs], gids), 'Could not find all gids!'
+
+    return locs
+
+
 @pytest.fixture
 def sc_points():
     """Get the supply curve aggregation summary table"""
@@ -74,6 +100,21 @@ def sc_points():
     return sc_points
 
 
+@pytest.fixture(scope='module')
+def sc_summary():
+    """Run the offshore SC aggregation once per module and get the summary
+    table"""
+    s = SupplyCurveAggregation.summary(EXCL_FPATH, OFFSHORE_BASELINE, TM_DSET,
+                                       excl_dict=EXCL_DICT,
+                                       res_class_dset=RES_CLASS_DSET,
+                                       res_class_bins=RES_CLASS_BINS,
+                                       cf_dset=CF_DSET, lcoe_dset=LCOE_DSET,
+                                       data_layers=DATA_LAYERS,
+                                       max_workers=1)
+
+    return s
+
+
 @pytest.fixture
 def offshore():
     """Offshore module object for tests and plotting."""
@@ -81,63 +122,101 @@ def offshore():
     obj = Offshore.run(GEN_FPATH, OFFSHORE_FPATH, POINTS, SAM_FILE,
                        fpath_out=OUTPUT_FILE, sub_dir=None)
 
-    return obj
+    yield obj
 
+    if PURGE_OUT and os.path.exists(OUTPUT_FILE):
+        os.remove(OUTPUT_FILE)
 
-def test_offshore_module(offshore):
-    """Run an offshore module test and validate a few outputs against
-    the raw gen output."""
-    assert len(offshore.out['cf_mean']) == len(offshore.meta_out_offshore)
-    assert all(offshore.meta_out['gid'] == sorted(offshore.meta_out['gid']))
-    assert len(offshore.meta_out['gid'].unique()) == len(offshore.meta_out)
 
-    with Outputs(GEN_FPATH, mode='r') as source:
-        with Outputs(OUTPUT_FILE, mode='r') as out:
+@pytest.fixture(scope='module')
+def source_data():
+    """Source gen meta and datasets, read once for the offshore checks."""
+    with Outputs(GEN_FPATH, mode='r', libver='latest') as source:
+        data = {dset: source[dset]
+                for dset in ('cf_mean', 'lcoe_fcr', 'ws_mean', 'cf_profile')}
+        data['meta'] = source.meta
+
+    return data
 
-            source_meta = source.meta
-            source_mean_data = source['cf_mean']
-            source_lcoe_data = source['lcoe_fcr']
-            source_ws_data = source['ws_mean']
-            source_profile_data = source['cf_profile']
 
-            out_meta = out.meta
-            out_mean_data = out['cf_mean']
-            out_lcoe_data = out['lcoe_fcr']
-            out_ws_data = out['ws_mean']
-            out_profile_data = out['cf_profile']
+def check_onshore_data(source_data, out_data, onshore_gids):
+    """Check that onshore source data was passed through to the offshore
+    module output file unchanged.
+
+    Parameters
+    ----------
+    source_data : dict
+        Source gen meta and datasets from the source_data fixture.
+    out_data : dict
+        Offshore module output meta and datasets.
+    onshore_gids : np.ndarray
+        Onshore resource gids to check.
+    """
+    source_locs = get_gid_locs(source_data['meta']['gid'].values,
+                               onshore_gids)
+    out_locs = get_gid_locs(out_data['meta']['gid'].values, onshore_gids)
+
+    m = ('Source onshore "{}" data for gids {} does not match '
+         'output file data.')
+    for dset in ('lcoe_fcr', 'ws_mean', 'cf_mean'):
+        check = source_data[dset][source_locs] == out_data[dset][out_locs]
+        assert check.all(), m.format(dset, onshore_gids[~check])
+
+    check = np.isclose(source_data['cf_profile'][:, source_locs],
+                       out_data['cf_profile'][:, out_locs]).all(axis=0)
+    assert check.all(), m.format('cf_profile', onshore_gids[~check])
+
+
+def test_offshore_module(offshore, source_data):
+    """Run an offshore module test and validate a few outputs against
+    the raw gen output."""
+    assert len(offshore.out['cf_mean']) == len(offshore.meta_out_offshore)
+    # strictly increasing gids are both sorted and unique
+    assert (np.diff(offshore.meta_out['gid'].values) > 0).all()
+
+    source_mean_data = source_data['cf_mean']
+    source_lcoe_data = source_data['lcoe_fcr']
+    source_ws_data = source_data['ws_mean']
+    source_profile_data = source_data['cf_profile']
+
+    # only read the output datasets needed for the onshore check if there
+    # are onshore sites to check
+    onshore_gids = np.array(offshore.onshore_gids)
+    with Outputs(OUTPUT_FILE, mode='r', libver='latest') as out:
+        out_data = {'meta': out.meta, 'cf_profile': out['cf_profile']}
+        if onshore_gids.size:
+            out_data.update({dset: out[dset] for dset
+                             in ('lcoe_fcr', 'ws_mean', 'cf_mean')})
+
+    out_meta = out_data['meta']
+    out_profile_data = out_data['cf_profile']
+    if onshore_gids.size:
+        check_onshore_data(source_data, out_data, onshore_gids)
 
     for col in Offshore.DEFAULT_META_COLS:
         msg = ('Offshore data column "{}" was not passed through to meta'
                .format(col))
         assert col in out_meta, msg
 
-    for gid in offshore.onshore_gids:
-        source_loc = np.where(source_meta['gid'] == gid)[0][0]
-        out_loc = np.where(out_meta['gid'] == gid)[0][0]
-
-        check_lcoe = (source_lcoe_data[source_loc]
-                      == out_lcoe_data[out_loc])
-        check_ws = (source_ws_data[source_loc]
-                    == out_ws_data[out_loc])
-        check_mean = (source_mean_data[source_loc]
-                      == out_mean_data[out_loc])
-        check_profile = np.allclose(source_profile_data[:, source_loc],
-                                    out_profile_data[:, out_loc])
-        m = ('Source onshore "{}" data for gid {} does not match '
-             'output file data.')
-        assert check_lcoe, m.format('lcoe', gid)
-        assert check_ws, m.format('ws_mean', gid)
-        assert check_mean, m.format('cf_mean', gid)
-        assert check_profile, m.format('cf_profile', gid)
+    # one small stdlib json parse for all checked farms, orjson not needed
+    farms = offshore.meta_out_offshore.iloc[:20]
+    farm_gids = farms['gid'].values
+    farm_agg_gids = json.loads('[{}]'.format(
+        ','.join(farms['offshore_res_gids'].values)))
+
+    # map the resource gids of all checked farms to source rows at once,
+    # sorted so the means below sum in the same order as the module
+    counts = np.array([len(agg_gids) for agg_gids in farm_agg_gids])
+    rows = get_gid_locs(offshore.meta_source_full['gid'].values,
+                        np.concatenate(farm_agg_gids).astype(np.int64))
+    farm_rows = [np.sort(r) for r in np.split(rows, np.cumsum(counts)[:-1])]
 
     for i in range(0, 20):
 
-        agg_gids = offshore.meta_out_offshore.iloc[i]['offshore_res_gids']
-        agg_gids = json.loads(agg_gids)
-        farm_gid = offshore.meta_out_offshore.iloc[i]['gid']
+        agg_gids = farm_agg_gids[i]
+        farm_gid = farm_gids[i]
 
-        mask = np.isin(offshore.meta_source_full['gid'].values, agg_gids)
-        gen_gids = np.where(mask)[0]
+        gen_gids = farm_rows[i]
         if not any(gen_gids):
             raise ValueError('Could not find offshore farm gid {} resource '
                              'gids in meta source: {}'
@@ -146,7 +225,6 @@ def test_offshore_module(offshore):
         ws_mean = source_ws_data[gen_gids]
         lcoe_land = source_lcoe_data[gen_gids]
         cf_mean = source_mean_data[gen_gids]
-        cf_profile = source_profile_data[:, gen_gids]
 
         m = 'Offshore lcoe was average aggregated instead of ORCA!'
         assert offshore.out['lcoe_fcr'][i] != lcoe_land.mean(), m
@@ -154,38 +232,46 @@ def test_offshore_module(offshore):
         m = 'Offshore output data "{}" does not match average source data!'
         check_cf_mean = offshore.out['cf_mean'][i] == cf_mean.mean()
         check_ws_mean = offshore.out['ws_mean'][i] == ws_mean.mean()
-        check_profiles = np.allclose(offshore.out['cf_profile'][:, i],
-                                     cf_profile.mean(axis=1))
         assert check_cf_mean, m.format('cf_mean')
         assert check_ws_mean, m.format('ws_mean')
-        assert check_profiles, m.format('cf_profile')
-
-    for i, gid in enumerate(offshore.offshore_gids):
-        out_loc = np.where(out_meta['gid'] == gid)[0][0]
-        arr1 = offshore.out['cf_profile'][:, i]
-        arr2 = out_profile_data[:, out_loc]
-        arr1 = np.round(arr1, decimals=3)
-        diff = (arr1 - arr2)
-        diff /= arr2
-        m = ('Offshore cf profile data does not match output file data '
-             'for gid {}'.format(gid))
-        assert np.allclose(arr1, arr2), m
-
-    if PURGE_OUT:
-        os.remove(OUTPUT_FILE)
+
+    # average the profiles of all checked farms in one batched reduction
+    offsets = np.cumsum(counts) - counts
+    cf_profiles = np.add.reduceat(source_profile_data[:, np.concatenate(
+        farm_rows)], offsets, axis=1, dtype=np.float64) / counts
+    check_profiles = np.isclose(offshore.out['cf_profile'][:, :20],
+                                cf_profiles).all(axis=0)
+    assert check_profiles.all(), m.format('cf_profile')
+
+    offshore_gids = np.array(offshore.offshore_gids)
+    out_locs = get_gid_locs(out_meta['gid'].values, offshore_gids)
+    arr1 = np.round(offshore.out['cf_profile'], decimals=3)
+    arr2 = out_profile_data[:, out_locs]
+    check = np.isclose(arr1, arr2).all(axis=0)
+    m = ('Offshore cf profile data does not match output file data '
+         'for gids {}'.format(offshore_gids[~check]))
+    assert check.all(), m
 
 
-def test_sc_agg_offshore():
+def test_parse_offshore_parquet():
+    """Test that a parquet offshore data file parses the same as the csv"""
+    pytest.importorskip('pyarrow')
+    baseline, baseline_coords = Offshore._parse_offshore_fpath(OFFSHORE_FPATH)
+
+    with tempfile.TemporaryDirectory() as td:
+        fp = os.path.join(td, 'offshore.parquet')
+        pd.read_csv(OFFSHORE_FPATH).to_parquet(fp, index=False)
+        test, test_coords = Offshore._parse_offshore_fpath(fp)
+
+    pd.testing.assert_frame_equal(baseline, test)
+    pd.testing.assert_frame_equal(baseline_coords, test_coords)
+
+
+def test_sc_agg_offshore(sc_summary):
     """Test the SC offshore aggregation and check offshore SC points against
     known offshore gen points."""
 
-    s = SupplyCurveAggregation.summary(EXCL_FPATH, OFFSHORE_BASELINE, TM_DSET,
-                                       excl_dict=EXCL_DICT,
-                                       res_class_dset=RES_CLASS_DSET,
-                                       res_class_bins=RES_CLASS_BINS,
-                                       cf_dset=CF_DSET, lcoe_dset=LCOE_DSET,
-                                       data_layers=DATA_LAYERS,
-                                       max_workers=1)
+    s = sc_summary
 
     for col in Offshore.DEFAULT_META_COLS:
         msg = ('Offshore data column "{}" was not passed through to agg table'
@@ -196,21 +282,24 @@ def test_sc_agg_offshore():
         meta = out.meta
 
     offshore_mask = (meta.offshore == 1)
-    offshore_gids = meta.loc[offshore_mask, 'gid'].values.tolist()
+    offshore_gids = meta.loc[offshore_mask, 'gid'].values
+    offshore_set = set(offshore_gids.tolist())
+
+    sc_offshore = s['offshore'].astype(bool)
+    for sc_gid in s.index[sc_offshore]:
+        assert int(s.at[sc_gid, 'farm_gid']) in offshore_set
+        assert all(np.array(json.loads(s.at[sc_gid, 'res_gids'])) < 3e6)
+        assert s.at[sc_gid, 'elevation'] == 0.0
+        assert s.at[sc_gid, 'capacity'] == 600
+        assert np.isnan(s.at[sc_gid, 'pct_slope'])
 
-    for sc_gid in s.index:
-        if s.at[sc_gid, 'offshore']:
-            assert int(s.at[sc_gid, 'farm_gid']) in offshore_gids
-            assert all(np.array(json.loads(s.at[sc_gid, 'res_gids'])) < 3e6)
-            assert s.at[sc_gid, 'elevation'] == 0.0
-            assert s.at[sc_gid, 'capacity'] == 600
-            assert np.isnan(s.at[sc_gid, 'pct_slope'])
-        else:
-            for res_gid in s.at[sc_gid, 'res_gids']:
-                assert res_gid not in offshore_gids
+    onshore_res_gids = [np.asarray(res_gids, dtype=np.int64)
+                        for res_gids in s.loc[~sc_offshore, 'res_gids']]
+    if onshore_res_gids:
+        onshore_res_gids = np.concatenate(onshore_res_gids)
+        assert not np.isin(onshore_res_gids, offshore_gids).any()
 
-    for gid in offshore_gids:
-        assert gid in s['farm_gid'].values
+    assert np.isin(offshore_gids, s['farm_gid'].values).all()
 
 
 def test_offshore_sc_compute(sc_points):
@@ -253,9 +342,8 @@ def plot_map(offshore):
                 c=(0.5, 0.5, 0.5), marker='s')
 
     cs = ['r', 'g', 'c', 'm', 'y', 'b'] * 100
-    for ic, i in enumerate(np.unique(offshore._i)):
+    for ic, (i, ilocs) in enumerate(offshore._farm_ilocs.items()):
         if i != -1:
-            ilocs = np.where(offshore._i == i)[0]
             plt.scatter(offshore.meta_source_offshore.iloc[ilocs]['longitude'],
                         offshore.meta_source_offshore.iloc[ilocs]['latitude'],
                         c=cs[ic], marker='s')
@@ -276,8 +364,7 @@ def plot_timeseries(offshore, i=0):
     agg_gids = json.loads(agg_gids)
 
     with Outputs(GEN_FPATH) as out:
-        mask = np.isin(out.meta['gid'], agg_gids)
-        gen_gids = np.where(mask)[0]
+        gen_gids = np.sort(get_gid_locs(out.meta['gid'].values, agg_gids))
         cf_profile = out['cf_profile', :, gen_gids]
 
     tslice = slice(100, 120)
@@ -186,6 +186,26 @@ def test_inclusion_mask(scenario):
     assert np.allclose(truth, dict_test)
 
 
+@pytest.mark.parametrize(('ds_slice'),
+                         [(slice(64, 128), slice(64, 128)),
+                          (slice(0, 64), slice(0, 64))])
+def test_zero_min_area(ds_slice):
+    """
+    Test that min_area=0 returns the unfiltered mask for a sliced extent
+    """
+    excl_h5 = os.path.join(TESTDATADIR, 'ri_exclusions', 'ri_exclusions.h5')
+    layers_dict = CONFIGS['urban_pv']
+    with ExclusionMaskFromDict(excl_h5, layers_dict=layers_dict) as f:
+        truth = f[ds_slice]
+
+    with ExclusionMaskFromDict(excl_h5, layers_dict=layers_dict,
+                               min_area=0) as f:
+        test = f[ds_slice]
+
+    assert test.shape == truth.shape
+    assert np.allclose(truth, test)
+
+
 def test_bad_layer():
     """
     Test creation of inclusion mask
@@ -335,6 +355,34 @@ def test_force_inclusion():
     assert np.allclose(test, truth)
 
 
+@pytest.mark.parametrize(('dtype', 'values'),
+                         [('uint8', [1, 3, 255]),
+                          ('int8', [-128, -1, 0, 5, 300]),
+                          ('uint16', [0, 100, 65535]),
+                          ('int16', [-1, 101, 102.0, 102.5]),
+                          ('int32', [1, 2]),
+                          ('float32', [1.5, 2])])
+def test_value_mask_lookup(dtype, values):
+    """
+    Test lookup table value masks against np.isin
+    """
+    if np.dtype(dtype).kind == 'f':
+        data = np.random.uniform(-5, 5, (100, 100)).astype(dtype)
+        data[:10] = 1.5
+    else:
+        info = np.iinfo(dtype)
+        data = np.random.randint(max(info.min, -1000), min(info.max, 1000),
+                                 size=(100, 100)).astype(dtype)
+        data[:10, :10] = values[0]
+
+    layer = LayerMask('test', include_values=values)
+    truth = np.isin(data, values)
+    assert truth.any()
+    assert np.array_equal(layer._value_mask(data, values), truth)
+    assert np.array_equal(layer._value_mask(data, values, include=False),
+                          ~truth)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 